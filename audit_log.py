@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Append-only audit log for login history and security events
+Events are buffered in memory, flushed in batches to hourly segment files and served from a per-user index
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Segment kinds mirror the login_history and security_events tables
+KINDS = ("login_history", "security_events")
+
+# (segment path, byte offset, byte length) of one flushed event
+IndexEntry = Tuple[str, int, int]
+
+
+class AuditLog:
+    """Batched, append-only audit log with per-user history lookups"""
+
+    def __init__(self, directory: str, flush_interval: float = 1.0, batch_size: int = 512,
+                 capacity: int = 65536, fsync: bool = False):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+        self._buffer: deque = deque()
+        self._in_flight: List[Tuple[str, Dict]] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._index: Dict[Tuple[str, int], List[IndexEntry]] = {}
+        self._ids = itertools.count(self._load_index() + 1)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.stats = {
+            "recorded_events": 0,
+            "flushed_events": 0,
+            "flush_batches": 0,
+            "flush_seconds": 0.0,
+            "inline_flushes": 0,
+        }
+
+    def record_login(self, user_id: int, success: bool, ip_address: Optional[str] = None,
+                     user_agent: Optional[str] = None) -> None:
+        """Record a login attempt"""
+        self._append("login_history", {
+            "user_id": user_id,
+            "success": success,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        })
+
+    def record_security_event(self, user_id: int, event_type: str, severity: str = "info",
+                              details: Optional[Dict] = None) -> None:
+        """Record a security event"""
+        self._append("security_events", {
+            "user_id": user_id,
+            "event_type": event_type,
+            "severity": severity,
+            "details": details or {},
+        })
+
+    def _append(self, kind: str, event: Dict) -> None:
+        event = {"id": next(self._ids), **event,
+                 "created_at": datetime.now(timezone.utc).isoformat()}
+        with self._buffer_lock:
+            self._buffer.append((kind, event))
+            size = len(self._buffer)
+        self.stats["recorded_events"] += 1
+        if size >= self.capacity:
+            # Backpressure instead of dropping audit events
+            self.stats["inline_flushes"] += 1
+            self.flush()
+        elif size >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write buffered events to their segment files; returns the number of events written"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                if not self._buffer:
+                    return 0
+                self._in_flight = list(self._buffer)
+                self._buffer.clear()
+            start = time.perf_counter()
+
+            by_segment: Dict[str, List[Tuple[str, Dict, bytes]]] = {}
+            for kind, event in self._in_flight:
+                line = (json.dumps(event, ensure_ascii=False) + "\n").encode()
+                by_segment.setdefault(self._segment_path(kind, event["created_at"]), []).append((kind, event, line))
+
+            new_entries = []
+            written_ids = set()
+            try:
+                for path, lines in by_segment.items():
+                    with open(path, "a+b") as f:
+                        offset = f.tell()
+                        if offset and os.pread(f.fileno(), 1, offset - 1) != b"\n":
+                            # Close off a line torn by an earlier failed write
+                            f.write(b"\n")
+                            offset += 1
+                        f.write(b"".join(line for _, _, line in lines))
+                        f.flush()
+                        if self.fsync:
+                            os.fsync(f.fileno())
+                    for kind, event, line in lines:
+                        new_entries.append(((kind, event["user_id"]), (path, offset, len(line))))
+                        written_ids.add(event["id"])
+                        offset += len(line)
+            finally:
+                with self._buffer_lock:
+                    for key, entry in new_entries:
+                        self._index.setdefault(key, []).append(entry)
+                    # Events that didn't reach disk go back in front of newer ones for the next flush
+                    self._buffer.extendleft(reversed([item for item in self._in_flight
+                                                      if item[1]["id"] not in written_ids]))
+                    self._in_flight = []
+            written = len(written_ids)
+            self.stats["flushed_events"] += written
+            self.stats["flush_batches"] += 1
+            self.stats["flush_seconds"] += time.perf_counter() - start
+            return written
+
+    def history(self, user_id: int, kind: str = "login_history", limit: int = 50) -> List[Dict]:
+        """Most recent events of one kind for a user, newest first"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown audit kind: {kind}")
+        with self._buffer_lock:
+            pending = [event for k, event in itertools.chain(self._in_flight, self._buffer)
+                       if k == kind and event["user_id"] == user_id]
+            entries = list(self._index.get((kind, user_id), ())[-limit:])
+        events = pending[::-1][:limit]
+        files = {}
+        try:
+            for path, offset, length in reversed(entries):
+                if len(events) >= limit:
+                    break
+                if path not in files:
+                    files[path] = open(path, "rb")
+                events.append(json.loads(os.pread(files[path].fileno(), length, offset)))
+        finally:
+            for f in files.values():
+                f.close()
+        return events
+
+    def start(self) -> None:
+        """Flush in a background thread every flush_interval seconds or whenever a batch fills up"""
+        if self._flusher:
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                try:
+                    self.flush()
+                except Exception:
+                    # Unwritten events were put back in the buffer; the next flush retries them
+                    logging.getLogger(__name__).exception("Audit log flush failed")
+
+        self._stop.clear()
+        self._flusher = threading.Thread(target=run, name="audit-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop the background flusher and write what is left"""
+        if self._flusher:
+            self._stop.set()
+            self._wakeup.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _segment_path(self, kind: str, created_at: str) -> str:
+        # Hourly partitions, e.g. login_history-2024011513.jsonl
+        hour = created_at[:13].replace("-", "").replace("T", "")
+        return os.path.join(self.directory, f"{kind}-{hour}.jsonl")
+
+    def _load_index(self) -> int:
+        """Rebuild the per-user index from existing segments; returns the highest event id"""
+        last_id = 0
+        for name in sorted(os.listdir(self.directory)):
+            kind = name.rsplit("-", 1)[0]
+            if kind not in KINDS or not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.directory, name)
+            offset = 0
+            with open(path, "r+b") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                        event_id = int(event["id"])
+                        entries = self._index.setdefault((kind, event["user_id"]), [])
+                    except (ValueError, TypeError, KeyError):
+                        if not line.endswith(b"\n"):
+                            # Torn write at the end of a segment: cut it so later appends start a clean line
+                            f.truncate(offset)
+                            break
+                        offset += len(line)
+                        continue
+                    if not line.endswith(b"\n"):
+                        f.write(b"\n")
+                        line += b"\n"
+                    entries.append((path, offset, len(line)))
+                    last_id = max(last_id, event_id)
+                    offset += len(line)
+        return last_id
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks for TechVerse Platform
+Runs local micro-benchmarks for the simple backend subsystems (no servers required)
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from starlette.middleware.cors import CORSMiddleware
+
+from audit_log import AuditLog
+from cors_cache import CachedCORSMiddleware
+from db_router import DatabaseRouter
+from http_cache import HTTPCacheMiddleware, brotli
+from mock_data import MockStore
+from search_index import SearchIndex
+from sharded_counter import ShardedCounter
+
+
+def _json_app(payload: bytes):
+    """Minimal ASGI app returning a fixed JSON payload"""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(payload)).encode())]})
+        await send({"type": "http.response.body", "body": payload})
+    return app
+
+
+async def _asgi_get(app, headers, method="GET"):
+    """Issue one request against an ASGI app, returning (status, headers, body)"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/api/techconnect/chats",
+             "query_string": b"", "headers": headers}
+    await app(scope, receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+class TechVerseBenchmark:
+    def __init__(self):
+        self.results = []
+
+    def log_result(self, name, metrics):
+        """Log benchmark result"""
+        self.results.append({
+            "benchmark": name,
+            "metrics": metrics,
+            "timestamp": datetime.now().isoformat()
+        })
+        summary = ", ".join(f"{key}={value}" for key, value in metrics.items())
+        print(f"⏱️  {name}: {summary}")
+
+    def run_all_benchmarks(self):
+        """Run all benchmarks"""
+        print("🚀 Starting TechVerse Performance Benchmarks")
+        print("=" * 60)
+
+        self.benchmark_search()
+        self.benchmark_pledge_counter()
+        self.benchmark_compression()
+        self.benchmark_cors_preflight()
+        self.benchmark_mock_data()
+        self.benchmark_db_routing()
+        self.benchmark_audit_log()
+
+        self.generate_report()
+
+    def benchmark_search(self, documents=1_000_000, queries=200):
+        """Typeahead and ranked query latency against the <10ms target at 1M documents"""
+        print("\n🔎 Benchmarking full-text search...")
+
+        rng = random.Random(42)
+        words = ["python", "react", "finance", "blockchain", "design", "data", "cloud", "security",
+                 "الذكاء", "الاصطناعي", "تصميم", "البرمجة", "التمويل", "مجتمع"]
+        words += [f"term{i}" for i in range(20000)]
+        modules = ("techlearn", "techmarket", "techhub")
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.index_many(
+            (modules[i % 3], i, " ".join(rng.choices(words, k=4)), " ".join(rng.choices(words, k=12)))
+            for i in range(documents)
+        )
+        self.log_result("Search Index Build", {
+            "documents": documents,
+            "build_s": round(time.perf_counter() - start, 1),
+        })
+
+        prefixes = ["p", "py", "pyt", "se", "الذ", "ال", "تص", "term1", "term12", "term123", "python da"]
+        for name, prefix, terms in [("typeahead", True, prefixes),
+                                    ("ranked", False, ["python", "data cloud", "الذكاء", "term123"])]:
+            latencies = []
+            for i in range(queries):
+                query = terms[i % len(terms)]
+                start = time.perf_counter()
+                index.search(query, limit=10, prefix=prefix)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            self.log_result(f"Search Latency ({name})", {
+                "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+                "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+                "under_10ms": latencies[int(len(latencies) * 0.99)] < 0.010,
+            })
+
+    def benchmark_pledge_counter(self, writers=32, pledges_per_writer=200, hold_time=0.0005):
+        """Pledges/sec on one hot campaign with 1 vs N counter shards"""
+        print("\n💰 Benchmarking crowdfunding pledge counters...")
+
+        for num_shards in (1, 4, 16, 32):
+            # The hook holds the shard lock as long as a DB row-lock UPDATE would
+            counter = ShardedCounter(num_shards=num_shards, on_write=lambda: time.sleep(hold_time))
+
+            def pledge():
+                for _ in range(pledges_per_writer):
+                    counter.add(1, 10)
+
+            threads = [threading.Thread(target=pledge) for _ in range(writers)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            counter.compact()
+            amount, backers = counter.total(1)
+            assert backers == writers * pledges_per_writer
+            self.log_result(f"Pledge Counter ({num_shards} shard{'s' if num_shards > 1 else ''})", {
+                "pledges_per_sec": round(backers / elapsed),
+                "elapsed_s": round(elapsed, 3),
+                "total_amount": str(amount),
+            })
+
+    def benchmark_compression(self, sizes=(10, 1000, 10000), iterations=50):
+        """Bandwidth vs CPU for gzip/brotli levels, and middleware cost with and without 304s"""
+        print("\n🗜️  Benchmarking response compression and HTTP caching...")
+
+        for size in sizes:
+            payload = json.dumps({"chats": [
+                {"id": i, "name": f"Chat room {i}", "last_message": f"Message number {i}",
+                 "unread_count": i % 7}
+                for i in range(size)
+            ]}).encode()
+
+            codecs = [(f"gzip-{level}", lambda body, level=level: gzip.compress(body, compresslevel=level))
+                      for level in (1, 6, 9)]
+            if brotli is not None:
+                codecs += [(f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality))
+                           for quality in (1, 5, 11)]
+            for name, compress in codecs:
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    compressed = compress(payload)
+                elapsed = (time.perf_counter() - start) / iterations
+                self.log_result(f"Compression {name} ({size} items)", {
+                    "raw_bytes": len(payload),
+                    "compressed_bytes": len(compressed),
+                    "ratio": round(len(payload) / len(compressed), 2),
+                    "compress_ms": round(elapsed * 1000, 3),
+                })
+
+            middleware = HTTPCacheMiddleware(_json_app(payload))
+            request = [(b"accept-encoding", b"gzip, br")]
+            _, headers, _ = asyncio.run(_asgi_get(middleware, request))
+            conditional = request + [(b"if-none-match", headers[b"etag"])]
+
+            async def measure(app, request_headers):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await _asgi_get(app, request_headers)
+                return (time.perf_counter() - start) / iterations * 1000
+
+            self.log_result(f"HTTP Cache Middleware ({size} items)", {
+                "plain_ms": round(asyncio.run(measure(_json_app(payload), request)), 3),
+                "full_response_ms": round(asyncio.run(measure(middleware, request)), 3),
+                "not_modified_ms": round(asyncio.run(measure(middleware, conditional)), 3),
+                "bytes_saved_per_304": len(payload),
+            })
+
+    def benchmark_cors_preflight(self, iterations=2000):
+        """Preflight latency for Starlette's CORSMiddleware vs the cached CORS layer"""
+        print("\n🌍 Benchmarking CORS preflight handling...")
+
+        options = dict(allow_origins=["http://localhost:3003", "http://localhost:3000"],
+                       allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+        preflight = [(b"origin", b"http://localhost:3003"),
+                     (b"access-control-request-method", b"POST"),
+                     (b"access-control-request-headers", b"content-type, authorization")]
+        app = _json_app(b"{}")
+
+        for name, middleware in [("starlette", CORSMiddleware(app, **options)),
+                                 ("cached", CachedCORSMiddleware(app, **options))]:
+            async def measure():
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await _asgi_get(middleware, preflight, method="OPTIONS")
+                return (time.perf_counter() - start) / iterations * 1_000_000
+
+            self.log_result(f"CORS Preflight ({name})", {"preflight_us": round(asyncio.run(measure()), 2)})
+
+    def benchmark_mock_data(self, users=100_000, chats=10_000, messages=1_000_000,
+                            transactions=500_000, iterations=200):
+        """Generation, mmap reload and page serving cost for the synthetic data store"""
+        print("\n🗃️  Benchmarking mock data store...")
+
+        start = time.perf_counter()
+        store = MockStore.generate(users, chats, messages, transactions)
+        generate_s = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            store.save(directory)
+            save_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = MockStore.load(directory)
+            load_s = time.perf_counter() - start
+
+            for name, source in [("generated", store), ("mmap", loaded)]:
+                start = time.perf_counter()
+                for i in range(iterations):
+                    page = source.chats(i % 100 + 1, 50)
+                    source.messages(i % chats + 1, 1, 50)
+                    source.transactions(i % users + 1, 1, 20)
+                elapsed = (time.perf_counter() - start) / iterations
+                self.log_result(f"Mock Data Pages ({name})", {
+                    "three_pages_ms": round(elapsed * 1000, 3),
+                    "chat_page_bytes": len(json.dumps({"chats": page})),
+                })
+            loaded.close()
+
+        self.log_result("Mock Data Store", {
+            "rows": users + chats + messages + transactions,
+            "generate_s": round(generate_s, 2),
+            "save_s": round(save_s, 3),
+            "mmap_load_ms": round(load_s * 1000, 3),
+        })
+
+    def benchmark_db_routing(self, rows=200_000, oltp_ops=2000, dashboards=2):
+        """OLTP latency on the primary while dashboards run on the primary vs on analytics"""
+        print("\n🔀 Benchmarking OLTP/analytics routing...")
+
+        with tempfile.TemporaryDirectory() as directory:
+            router = DatabaseRouter(f"sqlite:///{directory}/oltp.db", f"sqlite:///{directory}/analytics.db")
+            router.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                           "amount REAL, type TEXT, created_at INTEGER)")
+            router.track("transactions")
+            with router.primary.transaction() as execute:
+                for i in range(rows):
+                    execute("INSERT INTO transactions (user_id, amount, type, created_at) "
+                            "VALUES (:user_id, :amount, :type, :created_at)",
+                            {"user_id": i % 5000, "amount": (i % 977) - 300.0,
+                             "type": ("deposit", "withdrawal")[i % 2], "created_at": i})
+            start = time.perf_counter()
+            router.sync_all(batch_size=5000)
+            sync_s = time.perf_counter() - start
+            self.log_result("Analytics Sync", {
+                "changes": rows,
+                "sync_s": round(sync_s, 2),
+                "changes_per_sec": round(rows / sync_s),
+            })
+
+            report = ("SELECT user_id, type, COUNT(*), SUM(amount), AVG(amount) "
+                      "FROM transactions GROUP BY user_id, type ORDER BY SUM(amount) DESC LIMIT 20")
+
+            def percentile(latencies, fraction):
+                latencies = sorted(latencies)
+                return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 3)
+
+            for name, run_report in [("no dashboards", None),
+                                     ("dashboards on primary", router.execute),
+                                     ("dashboards on analytics", router.analytics)]:
+                stop = threading.Event()
+
+                def dashboard():
+                    while not stop.is_set():
+                        run_report(report)
+
+                threads = [threading.Thread(target=dashboard) for _ in range(dashboards if run_report else 0)]
+                for thread in threads:
+                    thread.start()
+                reads, writes = [], []
+                for i in range(oltp_ops):
+                    start = time.perf_counter()
+                    if i % 10 == 0:
+                        router.execute("INSERT INTO transactions (user_id, amount, type, created_at) "
+                                       "VALUES (1, 10, 'deposit', 0)")
+                        writes.append(time.perf_counter() - start)
+                    else:
+                        router.execute("SELECT * FROM transactions WHERE id = :id", {"id": i * 37 % rows + 1})
+                        reads.append(time.perf_counter() - start)
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+                self.log_result(f"OLTP Latency ({name})", {
+                    "read_p50_ms": percentile(reads, 0.5),
+                    "read_p99_ms": percentile(reads, 0.99),
+                    "write_p99_ms": percentile(writes, 0.99),
+                })
+
+    def benchmark_audit_log(self, events=20_000, users=1000):
+        """Per-login audit cost: synchronous row-per-event writes vs the batched audit log"""
+        print("\n📝 Benchmarking audit logging...")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sync.jsonl")
+            latencies = []
+            for i in range(events // 10):
+                start = time.perf_counter()
+                with open(path, "a") as f:
+                    f.write(json.dumps({"user_id": i % users, "success": True}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            self.log_result("Audit Write (synchronous, fsync per event)", {
+                "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+                "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+            })
+
+            audit_log = AuditLog(os.path.join(directory, "audit"), flush_interval=0.05, fsync=True)
+            audit_log.start()
+            latencies = []
+            for i in range(events):
+                start = time.perf_counter()
+                audit_log.record_login(i % users, True, "127.0.0.1", "benchmark")
+                latencies.append(time.perf_counter() - start)
+            audit_log.stop()
+            latencies.sort()
+            self.log_result("Audit Write (batched)", {
+                "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+                "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+                "flush_batches": audit_log.stats["flush_batches"],
+            })
+
+            start = time.perf_counter()
+            for i in range(1000):
+                audit_log.history(i % users, limit=20)
+            self.log_result("Audit History Query", {
+                "per_query_us": round((time.perf_counter() - start) / 1000 * 1e6, 1),
+            })
+
+    def generate_report(self):
+        """Generate benchmark report"""
+        report = {
+            "summary": {
+                "total_benchmarks": len(self.results),
+                "timestamp": datetime.now().isoformat()
+            },
+            "detailed_results": self.results
+        }
+
+        with open("benchmark_report.json", "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n📄 Detailed report saved to: benchmark_report.json")
+
+
+if __name__ == "__main__":
+    benchmark = TechVerseBenchmark()
+    if len(sys.argv) > 1:
+        for name in sys.argv[1:]:
+            getattr(benchmark, f"benchmark_{name}")()
+        benchmark.generate_report()
+    else:
+        benchmark.run_all_benchmarks()
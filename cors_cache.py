@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CORS middleware with a preflight response cache for the TechVerse simple backend
+Answers OPTIONS preflights from prebuilt responses keyed by (origin, method, headers)
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = frozenset(("accept", "accept-language", "content-language", "content-type"))
+
+PreflightKey = Tuple[str, str, str]
+PreflightResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class CachedCORSMiddleware:
+    """ASGI CORS middleware that answers repeated preflights from a bounded cache"""
+
+    def __init__(self, app, allow_origins: Iterable[str] = (), allow_methods: Iterable[str] = ("GET",),
+                 allow_headers: Iterable[str] = (), allow_credentials: bool = False,
+                 expose_headers: Iterable[str] = (), max_age: int = 86400,
+                 max_cached_preflights: int = 1024, stats: Optional[Dict] = None):
+        self.app = app
+        allow_origins = list(allow_origins)
+        allow_methods = [method.upper() for method in allow_methods]
+        allow_headers = [header.lower() for header in allow_headers]
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = frozenset(allow_origins)
+        self.allow_all_methods = "*" in allow_methods
+        self.allow_methods = frozenset(ALL_METHODS if self.allow_all_methods else allow_methods)
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_headers = SAFELISTED_HEADERS | frozenset(allow_headers)
+        self.allow_credentials = allow_credentials
+        self.max_age = max_age
+        self.max_cached_preflights = max_cached_preflights
+        self._preflights: "OrderedDict[PreflightKey, PreflightResponse]" = OrderedDict()
+
+        # Headers added to every allowed simple (non-preflight) response, minus the origin
+        self._simple_headers: List[Tuple[str, str]] = []
+        if allow_credentials:
+            self._simple_headers.append(("access-control-allow-credentials", "true"))
+        expose_headers = list(expose_headers)
+        if expose_headers:
+            self._simple_headers.append(("access-control-expose-headers", ", ".join(expose_headers)))
+
+        self.stats = stats if stats is not None else {}
+        self.stats.update({
+            "preflight_requests": 0,
+            "preflight_cache_hits": 0,
+            "preflight_rejected": 0,
+            "preflight_seconds": 0.0,
+        })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        origin = headers.get("origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] == "OPTIONS" and "access-control-request-method" in headers:
+            await self._preflight(headers, origin, send)
+            return
+        await self.app(scope, receive, self._simple_send(send, origin))
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def _preflight(self, headers: Headers, origin: str, send) -> None:
+        start = time.perf_counter()
+        key = (origin,
+               headers["access-control-request-method"].upper(),
+               headers.get("access-control-request-headers", "").lower())
+        response = self._preflights.get(key)
+        if response is not None:
+            self._preflights.move_to_end(key)
+            self.stats["preflight_cache_hits"] += 1
+        else:
+            response = self._build_preflight(*key)
+            # Rejections aren't cached: arbitrary client origins would push allowed entries out
+            if response[0] == 200:
+                self._preflights[key] = response
+                if len(self._preflights) > self.max_cached_preflights:
+                    self._preflights.popitem(last=False)
+        status, raw_headers, body = response
+        self.stats["preflight_requests"] += 1
+        if status != 200:
+            self.stats["preflight_rejected"] += 1
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+        self.stats["preflight_seconds"] += time.perf_counter() - start
+
+    def _build_preflight(self, origin: str, method: str, requested_headers: str) -> PreflightResponse:
+        failures = []
+        if not self.is_allowed_origin(origin):
+            failures.append("origin")
+        if method not in self.allow_methods:
+            failures.append("method")
+        requested = [header.strip() for header in requested_headers.split(",") if header.strip()]
+        if not self.allow_all_headers and any(h not in self.allow_headers for h in requested):
+            failures.append("headers")
+
+        headers = [(b"vary", b"Origin")]
+        if failures:
+            body = ("Disallowed CORS " + ", ".join(failures)).encode()
+            headers += [(b"content-type", b"text/plain; charset=utf-8"),
+                        (b"content-length", str(len(body)).encode())]
+            return 400, headers, body
+
+        # Credentialed requests can't use "*", so the requested method/headers are echoed back
+        allowed_methods = method if self.allow_all_methods else ", ".join(sorted(self.allow_methods))
+        allowed_headers = requested_headers if self.allow_all_headers else ", ".join(sorted(self.allow_headers))
+        headers += [
+            (b"access-control-allow-origin", origin.encode()),
+            (b"access-control-allow-methods", allowed_methods.encode()),
+            (b"access-control-max-age", str(self.max_age).encode()),
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+        ]
+        if allowed_headers:
+            headers.append((b"access-control-allow-headers", allowed_headers.encode()))
+        if self.allow_credentials:
+            headers.append((b"access-control-allow-credentials", b"true"))
+        return 200, headers, b"OK"
+
+    def _simple_send(self, send, origin: str):
+        allowed = self.is_allowed_origin(origin)
+
+        async def cors_send(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.add_vary_header("Origin")
+                if allowed:
+                    headers["access-control-allow-origin"] = origin
+                    for name, value in self._simple_headers:
+                        headers[name] = value
+            await send(message)
+
+        return cors_send
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Data-access router between the OLTP primary (MySQL techverse_db) and analytics (Postgres techverse_analytics)
+Writes and read-your-writes traffic go to the primary, reports go to analytics, and a CDC-style
+batched sync job keeps analytics fed. sqlite:/// URLs can stand in for both databases locally.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH|PRAGMA|EXPLAIN)\b", re.IGNORECASE)
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Declared column type fragment -> analytics column type; anything else is stored as TEXT
+_ANALYTICS_TYPES = (
+    ("INT", "BIGINT"),
+    ("DEC", "NUMERIC"),
+    ("NUMERIC", "NUMERIC"),
+    ("REAL", "DOUBLE PRECISION"),
+    ("FLOA", "DOUBLE PRECISION"),
+    ("DOUB", "DOUBLE PRECISION"),
+    ("DATETIME", "TIMESTAMP"),
+    ("TIMESTAMP", "TIMESTAMP"),
+    ("DATE", "DATE"),
+)
+
+
+# Change table on the primary, per dialect; triggers installed by track() append to it
+_CDC_TABLES = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS _cdc_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL,
+            pk TEXT NOT NULL,
+            payload TEXT
+        )
+    """,
+    "mysql": """
+        CREATE TABLE IF NOT EXISTS _cdc_changes (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            table_name VARCHAR(64) NOT NULL,
+            op VARCHAR(8) NOT NULL,
+            pk VARCHAR(255) NOT NULL,
+            payload JSON
+        )
+    """,
+}
+
+
+class _SQLiteDatabase:
+    """Thread-local sqlite3 connections to one database file"""
+
+    dialect = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            # WAL lets OLTP readers proceed while the sync job writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def execute(self, sql: str, params: Optional[Dict] = None) -> List[tuple]:
+        conn = self._connection()
+        with conn:
+            return conn.execute(sql, params or {}).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        conn = self._connection()
+        with conn:
+            yield lambda sql, params=None: conn.execute(sql, params or {}).fetchall()
+
+
+class _SQLAlchemyDatabase:
+    """MySQL/Postgres access through SQLAlchemy (optional dependency)"""
+
+    def __init__(self, url: str):
+        try:
+            from sqlalchemy import create_engine, text
+        except ImportError:
+            raise ImportError(f"SQLAlchemy is required to connect to {url.split(':')[0]} databases")
+        self._text = text
+        self._engine = create_engine(url, pool_pre_ping=True)
+        self.dialect = self._engine.dialect.name
+
+    def execute(self, sql: str, params: Optional[Dict] = None) -> List[tuple]:
+        with self.transaction() as execute:
+            return execute(sql, params)
+
+    @contextmanager
+    def transaction(self):
+        with self._engine.begin() as conn:
+            def execute(sql, params=None):
+                result = conn.execute(self._text(sql), params or {})
+                return [tuple(row) for row in result] if result.returns_rows else []
+            yield execute
+
+
+def connect(url: str):
+    """Open a database from a URL (sqlite:///path, mysql+pymysql://..., postgresql://...)"""
+    if url.startswith("sqlite:///"):
+        return _SQLiteDatabase(url[len("sqlite:///"):])
+    return _SQLAlchemyDatabase(url)
+
+
+class DatabaseRouter:
+    """Route statements between the OLTP primary and the analytics replica"""
+
+    def __init__(self, primary_url: str, analytics_url: str, settle_seconds: float = 5.0):
+        self.primary = connect(primary_url)
+        self.analytics_db = connect(analytics_url)
+        self._tracked: Dict[str, str] = {}
+        self._watermark = 0
+        # Change ids are assigned at insert but become visible at commit, so they can commit out
+        # of order. The watermark only moves over contiguous shipped ids; a gap is waited on for
+        # settle_seconds (longer than any OLTP transaction) before it's taken as a rollback.
+        self.settle_seconds = settle_seconds
+        self._shipped_ahead: Set[int] = set()
+        self._gap_since: Optional[float] = None
+        self._session_positions: Dict[str, int] = {}
+        self._positions_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {
+            "primary_writes": 0,
+            "primary_reads": 0,
+            "analytics_reads": 0,
+            "read_your_writes_fallbacks": 0,
+            "synced_changes": 0,
+            "sync_batches": 0,
+        }
+
+        if self.primary.dialect not in _CDC_TABLES:
+            raise ValueError(f"Change capture needs a SQLite or MySQL primary, not {self.primary.dialect}")
+        self.primary.execute(_CDC_TABLES[self.primary.dialect])
+        self.analytics_db.execute(
+            "CREATE TABLE IF NOT EXISTS _cdc_watermark (id INTEGER PRIMARY KEY, change_id BIGINT NOT NULL)"
+        )
+        rows = self.analytics_db.execute("SELECT change_id FROM _cdc_watermark WHERE id = 1")
+        self._watermark = rows[0][0] if rows else 0
+
+    @classmethod
+    def from_env(cls) -> "DatabaseRouter":
+        """Build a router from DATABASE_URL and POSTGRES_URL"""
+        return cls(os.environ["DATABASE_URL"], os.environ["POSTGRES_URL"])
+
+    def execute(self, sql: str, params: Optional[Dict] = None, session: Optional[str] = None) -> List[tuple]:
+        """Run an OLTP statement on the primary; writes advance the session's read-your-writes position"""
+        if _READ_STATEMENT.match(sql):
+            self.stats["primary_reads"] += 1
+            return self.primary.execute(sql, params)
+        self.stats["primary_writes"] += 1
+        with self.primary.transaction() as execute:
+            rows = execute(sql, params)
+            if session is not None and self._tracked:
+                position = execute("SELECT COALESCE(MAX(id), 0) FROM _cdc_changes")[0][0]
+                with self._positions_lock:
+                    self._session_positions[session] = max(position, self._session_positions.get(session, 0))
+        return rows
+
+    def analytics(self, sql: str, params: Optional[Dict] = None, session: Optional[str] = None) -> List[tuple]:
+        """Run a report query on analytics, unless the session has writes the sync hasn't shipped yet"""
+        if not _READ_STATEMENT.match(sql):
+            raise ValueError("Only read statements can be routed to analytics")
+        if session is not None:
+            with self._positions_lock:
+                caught_up = self._session_positions.get(session, 0) <= self._watermark
+                if caught_up:
+                    self._session_positions.pop(session, None)
+            if not caught_up:
+                self.stats["read_your_writes_fallbacks"] += 1
+                return self.primary.execute(sql, params)
+        self.stats["analytics_reads"] += 1
+        return self.analytics_db.execute(sql, params)
+
+    def track(self, table: str, pk: str = "id") -> None:
+        """Capture changes to `table` on the primary and create its mirror on analytics
+
+        The triggers copy the columns that exist when track() runs. Columns added later aren't
+        shipped until the migration also drops the _cdc_* triggers, adds the column on analytics
+        and calls track() again.
+        """
+        if self.primary.dialect == "sqlite":
+            columns = [(row[1], row[2]) for row in self.primary.execute(f"PRAGMA table_info({_quote(table)})")]
+        else:
+            columns = [(row[0], row[1]) for row in self.primary.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = :name ORDER BY ordinal_position",
+                {"name": table},
+            )]
+        if not columns:
+            raise ValueError(f"Unknown table: {table}")
+        payload = "json_object(" + ", ".join(f"'{c}', NEW.{_quote(c)}" for c, _ in columns) + ")"
+        with self.primary.transaction() as execute:
+            for event, row, op, body in [("INSERT", "NEW", "upsert", payload),
+                                         ("UPDATE", "NEW", "upsert", payload),
+                                         ("DELETE", "OLD", "delete", "NULL")]:
+                execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS _cdc_{table}_{event.lower()}
+                    AFTER {event} ON {_quote(table)} FOR EACH ROW
+                    BEGIN
+                        INSERT INTO _cdc_changes (table_name, op, pk, payload)
+                        VALUES ('{table}', '{op}', {row}.{_quote(pk)}, {body});
+                    END
+                """)
+        definitions = ", ".join(f"{_quote(c)} {_analytics_type(declared)}" for c, declared in columns)
+        self.analytics_db.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({definitions}, PRIMARY KEY ({_quote(pk)}))"
+        )
+        self._tracked[table] = pk
+
+    def sync(self, batch_size: int = 1000) -> int:
+        """Ship one batch of captured changes to analytics; returns the number of changes consumed"""
+        with self._sync_lock:
+            # Shipped changes are deleted, so everything left is pending, including late commits
+            # with ids below the watermark
+            changes = self.primary.execute(
+                "SELECT id, table_name, op, pk, payload FROM _cdc_changes ORDER BY id LIMIT :limit",
+                {"limit": batch_size},
+            )
+            ids = [change[0] for change in changes]
+            watermark, shipped_ahead = self._advance_watermark(
+                self._shipped_ahead | {change_id for change_id in ids if change_id > self._watermark}
+            )
+            if not changes and watermark == self._watermark:
+                return 0
+            # Only the last change per row matters within a batch
+            latest = {}
+            for change_id, table, op, pk, payload in changes:
+                latest[(table, pk)] = (op, payload)
+            with self.analytics_db.transaction() as execute:
+                for (table, pk), (op, payload) in latest.items():
+                    pk_column = _quote(self._tracked.get(table, "id"))
+                    execute(f"DELETE FROM {_quote(table)} WHERE {pk_column} = :pk", {"pk": pk})
+                    if op == "upsert":
+                        row = json.loads(payload)
+                        columns = ", ".join(_quote(column) for column in row)
+                        values = ", ".join(f":p{i}" for i in range(len(row)))
+                        execute(f"INSERT INTO {_quote(table)} ({columns}) VALUES ({values})",
+                                {f"p{i}": value for i, value in enumerate(row.values())})
+                execute("DELETE FROM _cdc_watermark WHERE id = 1")
+                execute("INSERT INTO _cdc_watermark (id, change_id) VALUES (1, :change_id)",
+                        {"change_id": watermark})
+            if ids:
+                placeholders = ", ".join(f":id{i}" for i in range(len(ids)))
+                self.primary.execute(f"DELETE FROM _cdc_changes WHERE id IN ({placeholders})",
+                                     {f"id{i}": change_id for i, change_id in enumerate(ids)})
+            self._watermark, self._shipped_ahead = watermark, shipped_ahead
+            # Sessions whose writes have all shipped no longer need read-your-writes tracking
+            with self._positions_lock:
+                for session in [s for s, position in self._session_positions.items() if position <= watermark]:
+                    del self._session_positions[session]
+            self.stats["synced_changes"] += len(changes)
+            self.stats["sync_batches"] += 1
+            return len(changes)
+
+    def _advance_watermark(self, shipped: Set[int]) -> Tuple[int, Set[int]]:
+        """Move the watermark over contiguous shipped ids, skipping gaps older than settle_seconds"""
+        watermark = self._watermark
+        shipped = set(shipped)
+        while shipped:
+            if watermark + 1 in shipped:
+                shipped.discard(watermark + 1)
+                watermark += 1
+                self._gap_since = None
+                continue
+            now = time.monotonic()
+            if self._gap_since is None:
+                self._gap_since = now
+            if now - self._gap_since < self.settle_seconds:
+                break
+            # Long-lived gap: the transaction that took these ids rolled back
+            watermark = min(shipped) - 1
+            self._gap_since = None
+        return watermark, shipped
+
+    def sync_all(self, batch_size: int = 1000) -> int:
+        """Drain every pending change"""
+        total = 0
+        while True:
+            synced = self.sync(batch_size)
+            if not synced:
+                return total
+            total += synced
+
+    def start_sync(self, interval: float = 1.0, batch_size: int = 1000) -> None:
+        """Run sync_all() every `interval` seconds in a background thread"""
+        if self._syncer:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self.sync_all(batch_size)
+
+        self._stop.clear()
+        self._syncer = threading.Thread(target=run, name="analytics-sync", daemon=True)
+        self._syncer.start()
+
+    def stop_sync(self) -> None:
+        """Stop the background sync job and ship what is left"""
+        if self._syncer:
+            self._stop.set()
+            self._syncer.join()
+            self._syncer = None
+        self.sync_all()
+
+    def lag(self) -> int:
+        """Number of captured changes not yet shipped to analytics"""
+        return self.primary.execute("SELECT COUNT(*) FROM _cdc_changes")[0][0]
+
+
+def _analytics_type(declared: str) -> str:
+    declared = (declared or "").upper()
+    for fragment, analytics_type in _ANALYTICS_TYPES:
+        if fragment in declared:
+            return analytics_type
+    return "TEXT"
+
+
+def _quote(identifier: str) -> str:
+    if not _IDENTIFIER.match(identifier):
+        raise ValueError(f"Invalid identifier: {identifier}")
+    return identifier
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Response compression and HTTP caching middleware for the TechVerse simple backend
+Adds gzip/brotli encoding, ETag/Last-Modified validators and 304 short-circuiting for GET routes
+"""
+
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Responses that must not be buffered or re-encoded
+_STREAMING_TYPES = ("text/event-stream",)
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+class _Validator:
+    __slots__ = ("etag", "last_modified", "checked_at")
+
+    def __init__(self, etag: str, last_modified: float, checked_at: float):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = checked_at
+
+
+class HTTPCacheMiddleware:
+    """ASGI middleware for compression, ETag/Last-Modified and conditional GETs"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 5, max_cached_payloads: int = 256,
+                 validator_ttl: float = 30.0, max_validators: int = 4096,
+                 exclude_paths: Iterable[str] = (), stats: Optional[Dict] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_cached_payloads = max_cached_payloads
+        self.validator_ttl = validator_ttl
+        self.max_validators = max_validators
+        # Routes whose payload changes without an unsafe request (counters, live status) are
+        # revalidated by their handler on every request instead of short-circuited
+        self.exclude_paths = tuple(exclude_paths)
+        # Compressed bodies keyed by (content hash, encoding); payloads are immutable per hash
+        self._compressed: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        # Latest validator per (path, query, credentials), oldest check first
+        self._validators: "OrderedDict[Tuple[str, bytes, str], _Validator]" = OrderedDict()
+        self.stats = stats if stats is not None else {}
+        self.stats.update({
+            "not_modified_short_circuit": 0,
+            "not_modified_after_handler": 0,
+            "compressed_responses": 0,
+            "compression_cache_hits": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "compress_seconds": 0.0,
+        })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            if scope["method"] not in SAFE_METHODS:
+                self.invalidate(scope["path"])
+            return
+
+        request_headers = Headers(scope=scope)
+        key = self._key(scope, request_headers)
+        validator = self._fresh_validator(key)
+        if validator and self._not_modified(request_headers, validator):
+            # Known-fresh validator: answer without running the handler
+            self.stats["not_modified_short_circuit"] += 1
+            await self._send_not_modified(send, validator)
+            return
+
+        start_message = None
+        body_parts: List[bytes] = []
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (message["status"] != 200 or "content-encoding" in headers
+                        or content_type.startswith(_STREAMING_TYPES)):
+                    passthrough = True
+                    await send(message)
+            else:
+                body_parts.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await self._send_buffered(send, request_headers, key,
+                                              start_message, b"".join(body_parts))
+
+        await self.app(scope, receive, buffered_send)
+
+    def invalidate(self, path: str) -> None:
+        """Expire validators for `path`, its sub-resources and its parent collections"""
+        # Expired entries stay until evicted so a changed body still gets a later Last-Modified
+        for key, validator in self._validators.items():
+            if key[0].startswith(path) or path.startswith(key[0]):
+                validator.checked_at = float("-inf")
+
+    def _fresh_validator(self, key) -> Optional[_Validator]:
+        validator = self._validators.get(key)
+        if validator and time.monotonic() - validator.checked_at < self.validator_ttl:
+            return validator
+        return None
+
+    def _store_validator(self, key, validator: _Validator) -> None:
+        self._validators[key] = validator
+        self._validators.move_to_end(key)
+        # Entries are kept in check order, so expired ones are always at the front
+        while self._validators:
+            oldest = next(iter(self._validators.values()))
+            if (len(self._validators) <= self.max_validators
+                    and validator.checked_at - oldest.checked_at < self.validator_ttl):
+                break
+            self._validators.popitem(last=False)
+
+    def _key(self, scope, headers: Headers) -> Tuple[str, bytes, str]:
+        # Responses may depend on who is asking, so credentials are part of the key
+        credentials = headers.get("authorization", "") + "|" + headers.get("cookie", "")
+        return scope["path"], scope.get("query_string", b""), credentials
+
+    @staticmethod
+    def _not_modified(headers: Headers, validator: _Validator, check_date: bool = True) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            return any(_base_etag(tag) == validator.etag or tag.strip() == "*"
+                       for tag in if_none_match.split(","))
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since and check_date:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(validator.last_modified) <= since
+        return False
+
+    async def _send_not_modified(self, send, validator: _Validator) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [
+                (b"etag", validator.etag.encode()),
+                (b"last-modified", formatdate(validator.last_modified, usegmt=True).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_buffered(self, send, request_headers: Headers, key, start_message, body: bytes) -> None:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        etag = f'"{digest}"'
+        previous = self._validators.get(key)
+        unchanged = previous is not None and previous.etag == etag
+        if unchanged:
+            validator = previous
+            validator.checked_at = time.monotonic()
+        else:
+            # Last-Modified has one-second resolution, so a changed body must move it forward
+            last_modified = max(time.time(), previous.last_modified + 1) if previous else time.time()
+            validator = _Validator(etag, last_modified, time.monotonic())
+        if not key[0].startswith(self.exclude_paths):
+            self._store_validator(key, validator)
+
+        # A date alone can't tell a new or changed body from the one the client holds
+        if self._not_modified(request_headers, validator, check_date=unchanged):
+            self.stats["not_modified_after_handler"] += 1
+            await self._send_not_modified(send, validator)
+            return
+
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        headers["last-modified"] = formatdate(validator.last_modified, usegmt=True)
+        if "cache-control" not in headers:
+            headers["cache-control"] = "no-cache"
+        headers.add_vary_header("Accept-Encoding")
+
+        self.stats["bytes_in"] += len(body)
+        encoding = self._choose_encoding(request_headers, headers, body)
+        if encoding:
+            body = self._compress(digest, encoding, body)
+            headers["content-encoding"] = encoding
+            etag = f'"{digest}-{encoding}"'
+            self.stats["compressed_responses"] += 1
+        headers["etag"] = etag
+        headers["content-length"] = str(len(body))
+        self.stats["bytes_out"] += len(body)
+
+        await send({**start_message, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+    def _choose_encoding(self, request_headers: Headers, headers: MutableHeaders,
+                         body: bytes) -> Optional[str]:
+        if len(body) < self.minimum_size:
+            return None
+        if not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES):
+            return None
+        accepted = request_headers.get("accept-encoding", "")
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, digest: str, encoding: str, body: bytes) -> bytes:
+        cache_key = (digest, encoding)
+        cached = self._compressed.get(cache_key)
+        if cached is not None:
+            self._compressed.move_to_end(cache_key)
+            self.stats["compression_cache_hits"] += 1
+            return cached
+        start = time.perf_counter()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        self.stats["compress_seconds"] += time.perf_counter() - start
+        self._compressed[cache_key] = compressed
+        if len(self._compressed) > self.max_cached_payloads:
+            self._compressed.popitem(last=False)
+        return compressed
+
+
+def _base_etag(tag: str) -> str:
+    """Strip weak prefix and encoding suffix so every variant of a payload compares equal"""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for encoding in ("-gzip", "-br"):
+        if tag.endswith(encoding + '"'):
+            return tag[:-len(encoding) - 1] + '"'
+    return tag
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Synthetic mock data for the TechVerse simple backend
+Seeded generator writing users, chats, messages and transactions into array-backed columns,
+with save/load through memory-mapped files for fast reloads
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List
+
+FIRST_NAMES = ["Ahmed", "Sara", "Omar", "Lina", "Youssef", "Mona", "Karim", "Nour",
+               "John", "Emily", "David", "Maria", "Ali", "Fatima", "Hassan", "Layla"]
+LAST_NAMES = ["Hassan", "Ali", "Smith", "Khalil", "Haddad", "Johnson", "Nasser", "Saleh",
+              "Brown", "Mansour", "Garcia", "Ibrahim"]
+ROLES = ["user", "user", "user", "user", "admin"]
+CHAT_TOPICS = ["Tech Innovation Group", "Finance Discussion", "Python Developers", "React Community",
+               "Blockchain Lab", "AI Research", "Startup Founders", "Design Critique",
+               "Cloud Engineering", "Security Circle", "Mobile Apps", "Data Science"]
+MESSAGE_TEXTS = ["Welcome to TechVerse!", "New investment opportunities", "Has anyone tried the new API?",
+                 "Meeting moved to 3pm", "Great work on the release 🎉", "Can someone review my PR?",
+                 "مرحبا بالجميع", "شكرا على المساعدة", "Sharing the slides from today",
+                 "Let's discuss this in the next call", "The build is green again", "Any feedback welcome"]
+TRANSACTION_TYPES = ["deposit", "withdrawal", "transfer", "investment"]
+
+EPOCH = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+
+# Column name -> array typecode; *_offsets columns are CSR indexes (rows for entity i are offsets[i]:offsets[i+1])
+COLUMNS = {
+    "user_first": "H",
+    "user_last": "H",
+    "user_role": "B",
+    "chat_topic": "H",
+    "chat_owner": "i",
+    "chat_unread": "H",
+    "chat_msg_offsets": "q",
+    "msg_sender": "i",
+    "msg_sent_at": "q",
+    "msg_text": "H",
+    "tx_user_offsets": "q",
+    "tx_amount_cents": "q",
+    "tx_type": "B",
+    "tx_date": "q",
+}
+
+
+def _offsets(rng: random.Random, groups: int, rows: int) -> array:
+    """Randomly distribute `rows` over `groups` and return CSR offsets"""
+    counts = array("q", bytes(8 * groups))
+    for _ in range(rows):
+        counts[rng.randrange(groups)] += 1
+    offsets = array("q", [0])
+    total = 0
+    for count in counts:
+        total += count
+        offsets.append(total)
+    return offsets
+
+
+class MockStore:
+    """Columnar in-memory store for generated TechVerse data"""
+
+    def __init__(self, columns: Dict[str, object], meta: Dict):
+        self.columns = columns
+        self.meta = meta
+        self._mmaps: List[mmap.mmap] = []
+
+    @property
+    def user_count(self) -> int:
+        return len(self.columns["user_first"])
+
+    @property
+    def chat_count(self) -> int:
+        return len(self.columns["chat_topic"])
+
+    # Generation
+    @classmethod
+    def generate(cls, users: int = 1000, chats: int = 200, messages: int = 10000,
+                 transactions: int = 5000, seed: int = 42) -> "MockStore":
+        """Generate a reproducible dataset of the requested size"""
+        if users < 1 or chats < 1:
+            raise ValueError("users and chats must be at least 1")
+        rng = random.Random(seed)
+        c = {name: array(typecode) for name, typecode in COLUMNS.items()}
+
+        c["user_first"] = array("H", (rng.randrange(len(FIRST_NAMES)) for _ in range(users)))
+        c["user_last"] = array("H", (rng.randrange(len(LAST_NAMES)) for _ in range(users)))
+        c["user_role"] = array("B", (rng.randrange(len(ROLES)) for _ in range(users)))
+
+        c["chat_topic"] = array("H", (rng.randrange(len(CHAT_TOPICS)) for _ in range(chats)))
+        c["chat_owner"] = array("i", (rng.randrange(users) + 1 for _ in range(chats)))
+        c["chat_unread"] = array("H", (min(int(rng.expovariate(0.3)), 999) for _ in range(chats)))
+
+        # Messages are grouped by chat in send order, so the last row of a group is the latest message
+        c["chat_msg_offsets"] = offsets = _offsets(rng, chats, messages)
+        for chat in range(chats):
+            sent_at = EPOCH + rng.randrange(86400 * 30)
+            for _ in range(offsets[chat + 1] - offsets[chat]):
+                sent_at += rng.randrange(1, 3600)
+                c["msg_sent_at"].append(sent_at)
+        c["msg_sender"] = array("i", (rng.randrange(users) + 1 for _ in range(messages)))
+        c["msg_text"] = array("H", (rng.randrange(len(MESSAGE_TEXTS)) for _ in range(messages)))
+
+        # Transactions are grouped by user in date order
+        c["tx_user_offsets"] = offsets = _offsets(rng, users, transactions)
+        for user in range(users):
+            date = EPOCH + rng.randrange(86400 * 30)
+            for _ in range(offsets[user + 1] - offsets[user]):
+                date += rng.randrange(3600, 86400 * 3)
+                c["tx_date"].append(date)
+        for _ in range(transactions):
+            kind = rng.randrange(len(TRANSACTION_TYPES))
+            cents = rng.randrange(100, 500000)
+            c["tx_type"].append(kind)
+            c["tx_amount_cents"].append(cents if TRANSACTION_TYPES[kind] == "deposit" else -cents)
+
+        meta = {"seed": seed, "users": users, "chats": chats,
+                "messages": messages, "transactions": transactions}
+        return cls(c, meta)
+
+    # Persistence
+    def save(self, directory: str) -> None:
+        """Write every column as a raw binary file plus meta.json"""
+        os.makedirs(directory, exist_ok=True)
+        for name, typecode in COLUMNS.items():
+            column = self.columns[name]
+            with open(os.path.join(directory, f"{name}.bin"), "wb") as f:
+                f.write(column.tobytes() if isinstance(column, array) else bytes(column))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str) -> "MockStore":
+        """Memory-map a saved dataset; columns are read lazily by the OS instead of parsed"""
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        columns, mmaps = {}, []
+        for name, typecode in COLUMNS.items():
+            with open(os.path.join(directory, f"{name}.bin"), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    columns[name] = array(typecode)
+                    continue
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mmaps.append(mapped)
+            columns[name] = memoryview(mapped).cast(typecode)
+        store = cls(columns, meta)
+        store._mmaps = mmaps
+        return store
+
+    # Queries
+    def chats(self, page: int, page_size: int) -> List[Dict]:
+        c = self.columns
+        start = (page - 1) * page_size
+        chats = []
+        for i in range(start, min(start + page_size, self.chat_count)):
+            last = c["chat_msg_offsets"][i + 1] - 1
+            has_messages = last >= c["chat_msg_offsets"][i]
+            chats.append({
+                "id": i + 1,
+                "name": f"{CHAT_TOPICS[c['chat_topic'][i]]} #{i + 1}",
+                "owner_id": c["chat_owner"][i],
+                "last_message": MESSAGE_TEXTS[c["msg_text"][last]] if has_messages else None,
+                "unread_count": c["chat_unread"][i],
+            })
+        return chats
+
+    def message_count(self, chat_id: int) -> int:
+        offsets = self.columns["chat_msg_offsets"]
+        return offsets[chat_id] - offsets[chat_id - 1]
+
+    def messages(self, chat_id: int, page: int, page_size: int) -> List[Dict]:
+        """Messages of one chat, newest first"""
+        c = self.columns
+        begin, end = c["chat_msg_offsets"][chat_id - 1], c["chat_msg_offsets"][chat_id]
+        top = end - (page - 1) * page_size
+        return [
+            {
+                "id": i + 1,
+                "chat_id": chat_id,
+                "sender_id": c["msg_sender"][i],
+                "text": MESSAGE_TEXTS[c["msg_text"][i]],
+                "sent_at": _isoformat(c["msg_sent_at"][i]),
+            }
+            for i in range(top - 1, max(top - page_size, begin) - 1, -1)
+        ]
+
+    def balance(self, user_id: int) -> float:
+        offsets = self.columns["tx_user_offsets"]
+        amounts = self.columns["tx_amount_cents"][offsets[user_id - 1]:offsets[user_id]]
+        return sum(amounts) / 100
+
+    def transaction_count(self, user_id: int) -> int:
+        offsets = self.columns["tx_user_offsets"]
+        return offsets[user_id] - offsets[user_id - 1]
+
+    def transactions(self, user_id: int, page: int, page_size: int) -> List[Dict]:
+        """Transactions of one user, newest first"""
+        c = self.columns
+        begin, end = c["tx_user_offsets"][user_id - 1], c["tx_user_offsets"][user_id]
+        top = end - (page - 1) * page_size
+        return [
+            {
+                "id": i + 1,
+                "amount": c["tx_amount_cents"][i] / 100,
+                "type": TRANSACTION_TYPES[c["tx_type"][i]],
+                "date": _isoformat(c["tx_date"][i])[:10],
+            }
+            for i in range(top - 1, max(top - page_size, begin) - 1, -1)
+        ]
+
+    def close(self) -> None:
+        """Release memory-mapped columns"""
+        for name, column in list(self.columns.items()):
+            if isinstance(column, memoryview):
+                column.release()
+                self.columns[name] = array(COLUMNS[name])
+        for mapped in self._mmaps:
+            mapped.close()
+        self._mmaps = []
+
+
+def _isoformat(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def store_from_env() -> MockStore:
+    """Load MOCK_DATA_DIR if it holds a dataset, otherwise generate one from MOCK_* sizes"""
+    directory = os.getenv("MOCK_DATA_DIR")
+    if directory and os.path.exists(os.path.join(directory, "meta.json")):
+        return MockStore.load(directory)
+    store = MockStore.generate(
+        users=int(os.getenv("MOCK_USERS", "1000")),
+        chats=int(os.getenv("MOCK_CHATS", "200")),
+        messages=int(os.getenv("MOCK_MESSAGES", "10000")),
+        transactions=int(os.getenv("MOCK_TRANSACTIONS", "5000")),
+        seed=int(os.getenv("MOCK_SEED", "42")),
+    )
+    if directory:
+        store.save(directory)
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate TechVerse mock data")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--chats", type=int, default=100_000)
+    parser.add_argument("--messages", type=int, default=5_000_000)
+    parser.add_argument("--transactions", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="mock_data")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = MockStore.generate(args.users, args.chats, args.messages, args.transactions, args.seed)
+    print(f"✅ Generated {args.users} users, {args.chats} chats, {args.messages} messages, "
+          f"{args.transactions} transactions in {time.perf_counter() - start:.1f}s")
+    store.save(args.out)
+    print(f"📄 Saved to: {args.out}/ (set MOCK_DATA_DIR={args.out} to serve it)")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Full-text search index for TechVerse content
+Embedded SQLite FTS5 index covering TechLearn courses, TechMarket listings and TechHub posts
+"""
+
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Modules that can be indexed, keyed by the name used in /api/search?module=
+MODULES = ("techlearn", "techmarket", "techhub")
+
+# Arabic diacritics (tashkeel), superscript alef and tatweel are dropped before indexing
+_ARABIC_MARKS = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+_ARABIC_FOLD = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي",
+})
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+# Definite article and attached conjunctions/prepositions (light stemming)
+_ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize Arabic and English text so queries match regardless of spelling variants"""
+    text = _ARABIC_MARKS.sub("", text or "")
+    return text.translate(_ARABIC_FOLD).lower()
+
+
+def _strip_arabic_prefix(token: str) -> str:
+    for prefix in _ARABIC_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            return token[len(prefix):]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into search tokens"""
+    return [_strip_arabic_prefix(token) for token in _TOKEN.findall(normalize_text(text))]
+
+
+def _index_terms(text: str) -> str:
+    """Indexed form of a text: stemmed tokens, plus the unstemmed and bare-article forms where
+    stemming changed it so typeahead still matches while the user is typing the article
+    (e.g. "الذ" -> "الذكاء", "البرمجة" -> "والبرمجة")"""
+    terms = []
+    for token in _TOKEN.findall(normalize_text(text)):
+        stem = _strip_arabic_prefix(token)
+        terms.append(stem)
+        if stem != token:
+            terms.append(token)
+            if token != "ال" + stem:
+                terms.append("ال" + stem)
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Inverted index over TechVerse content backed by SQLite FTS5"""
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    rowid INTEGER PRIMARY KEY,
+                    module TEXT NOT NULL,
+                    ref_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    UNIQUE (module, ref_id)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    title, body,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '1 2 3 4 5 6'
+                );
+            """)
+
+    def index(self, module: str, ref_id, title: str, body: str = "") -> None:
+        """Add or replace a single document"""
+        self.index_many([(module, ref_id, title, body)])
+
+    def index_many(self, documents: Iterable[Tuple]) -> None:
+        """Add or replace (module, ref_id, title, body) documents in a single transaction"""
+        with self._lock, self._conn:
+            for module, ref_id, title, body in documents:
+                self._index_one(module, ref_id, title, body)
+
+    def _index_one(self, module: str, ref_id, title: str, body: str) -> None:
+        if module not in MODULES:
+            raise ValueError(f"Unknown module: {module}")
+        row = self._conn.execute(
+            "SELECT rowid FROM documents WHERE module = ? AND ref_id = ?",
+            (module, str(ref_id)),
+        ).fetchone()
+        if row:
+            rowid = row[0]
+            self._conn.execute("UPDATE documents SET title = ? WHERE rowid = ?", (title, rowid))
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (rowid,))
+        else:
+            rowid = self._conn.execute(
+                "INSERT INTO documents (module, ref_id, title) VALUES (?, ?, ?)",
+                (module, str(ref_id), title),
+            ).lastrowid
+        self._conn.execute(
+            "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+            (rowid, _index_terms(title), _index_terms(body)),
+        )
+
+    def remove(self, module: str, ref_id) -> bool:
+        """Remove a document, returning False if it was not indexed"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT rowid FROM documents WHERE module = ? AND ref_id = ?",
+                (module, str(ref_id)),
+            ).fetchone()
+            if not row:
+                return False
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+            self._conn.execute("DELETE FROM documents WHERE rowid = ?", (row[0],))
+            return True
+
+    def search(self, query: str, module: Optional[str] = None,
+               limit: int = 20, prefix: bool = False) -> List[Dict]:
+        """Run a ranked search; with prefix=True the last token is matched as a prefix (typeahead)"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        if prefix:
+            # The word being typed is matched unstemmed: a partial "الذ" has no stem yet
+            tokens[-1] = _TOKEN.findall(normalize_text(query))[-1]
+        terms = " ".join(f'"{token}"' for token in tokens)
+        if prefix:
+            # Typeahead matches titles only and skips bm25 so FTS5 can stop at the
+            # first `limit` hits instead of ranking every document sharing the prefix
+            match = f"title : ({terms}*)"
+            score = "NULL"
+            order = "documents_fts.rowid DESC"
+        else:
+            match = terms
+            score = "bm25(documents_fts, 4.0, 1.0)"
+            order = "score"
+        sql = f"""
+            SELECT d.module, d.ref_id, d.title, {score} AS score
+            FROM documents_fts
+            JOIN documents d ON d.rowid = documents_fts.rowid
+            WHERE documents_fts MATCH ?
+        """
+        params = [match]
+        if module:
+            sql += " AND d.module = ?"
+            params.append(module)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"module": m, "id": ref_id, "title": title,
+             "score": None if score is None else round(-score, 4)}
+            for m, ref_id, title, score in rows
+        ]
+
+    def count(self) -> int:
+        """Number of indexed documents"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Sharded pledge counters for TechFinance crowdfunding campaigns
+Spreads hot-campaign writes over N sub-counters and folds them back into the campaign row
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Tuple
+
+# sink(project_id, amount_delta, backers_delta) persists compacted totals
+CompactionSink = Callable[[int, Decimal, int], None]
+
+
+class _Shard:
+    __slots__ = ("lock", "amounts", "backers")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.amounts: Dict[int, Decimal] = {}
+        self.backers: Dict[int, int] = {}
+
+
+class ShardedCounter:
+    """Running totals and backer counts per campaign, split over independent shards"""
+
+    def __init__(self, num_shards: int = 16, cache_ttl: float = 0.5, max_cached_totals: int = 4096,
+                 on_write: Optional[Callable[[], None]] = None):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.cache_ttl = cache_ttl
+        self.max_cached_totals = max_cached_totals
+        # Called while the shard lock is held, e.g. to simulate a row-lock UPDATE in benchmarks
+        self.on_write = on_write
+        self._shards = [_Shard() for _ in range(num_shards)]
+        # Totals already folded into the campaign row by compaction
+        self._base_lock = threading.Lock()
+        self._base: Dict[int, Tuple[Decimal, int]] = {}
+        # Deltas taken out of the shards that the sink hasn't persisted yet
+        self._pending: Dict[int, Tuple[Decimal, int]] = {}
+        self._compact_lock = threading.Lock()
+        # Recently read totals, oldest read first
+        self._cache: "OrderedDict[int, Tuple[float, Tuple[Decimal, int]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._sink: Optional[CompactionSink] = None
+        self._stop = threading.Event()
+
+    def _shard(self) -> _Shard:
+        # Chosen per call rather than per thread, so pledges from a single
+        # event-loop thread still spread over every shard
+        return self._shards[random.randrange(self.num_shards)]
+
+    def add(self, project_id: int, amount, backers: int = 1) -> None:
+        """Record a pledge"""
+        amount = Decimal(str(amount))
+        shard = self._shard()
+        with shard.lock:
+            if self.on_write:
+                self.on_write()
+            shard.amounts[project_id] = shard.amounts.get(project_id, Decimal(0)) + amount
+            shard.backers[project_id] = shard.backers.get(project_id, 0) + backers
+
+    def total(self, project_id: int) -> Tuple[Decimal, int]:
+        """Return (amount, backers), served from a short-lived cache"""
+        cached = self._cache.get(project_id)
+        now = time.monotonic()
+        if cached and now - cached[0] < self.cache_ttl:
+            return cached[1]
+        # Holding the base lock keeps compaction from moving deltas mid-read
+        with self._base_lock:
+            amount, backers = self._base.get(project_id, (Decimal(0), 0))
+            pending_amount, pending_backers = self._pending.get(project_id, (Decimal(0), 0))
+            amount += pending_amount
+            backers += pending_backers
+            for shard in self._shards:
+                with shard.lock:
+                    amount += shard.amounts.get(project_id, Decimal(0))
+                    backers += shard.backers.get(project_id, 0)
+        with self._cache_lock:
+            self._cache[project_id] = (now, (amount, backers))
+            self._cache.move_to_end(project_id)
+            # Entries are kept in read order, so expired ones are always at the front
+            while self._cache:
+                read_at = next(iter(self._cache.values()))[0]
+                if len(self._cache) <= self.max_cached_totals and now - read_at < self.cache_ttl:
+                    break
+                self._cache.popitem(last=False)
+        return amount, backers
+
+    def compact(self, sink: Optional[CompactionSink] = None) -> int:
+        """Fold all shard deltas into the base totals; returns the number of campaigns touched
+
+        If the sink raises, the deltas it hasn't persisted go back into a shard for the next run.
+        """
+        with self._compact_lock:
+            with self._base_lock:
+                for shard in self._shards:
+                    with shard.lock:
+                        amounts, backers = shard.amounts, shard.backers
+                        shard.amounts, shard.backers = {}, {}
+                    for project_id, amount in amounts.items():
+                        prev_amount, prev_backers = self._pending.get(project_id, (Decimal(0), 0))
+                        self._pending[project_id] = (prev_amount + amount,
+                                                     prev_backers + backers.get(project_id, 0))
+                deltas = list(self._pending.items())
+
+            # The sink does database I/O, so it runs without blocking total() readers
+            for project_id, (amount, backers) in deltas:
+                if sink:
+                    try:
+                        sink(project_id, amount, backers)
+                    except Exception:
+                        self._restore_pending()
+                        raise
+                with self._base_lock:
+                    del self._pending[project_id]
+                    base_amount, base_backers = self._base.get(project_id, (Decimal(0), 0))
+                    self._base[project_id] = (base_amount + amount, base_backers + backers)
+            return len(deltas)
+
+    def _restore_pending(self) -> None:
+        with self._base_lock:
+            pending, self._pending = self._pending, {}
+            shard = self._shard()
+            with shard.lock:
+                for project_id, (amount, backers) in pending.items():
+                    shard.amounts[project_id] = shard.amounts.get(project_id, Decimal(0)) + amount
+                    shard.backers[project_id] = shard.backers.get(project_id, 0) + backers
+
+    def start_compaction(self, interval: float, sink: Optional[CompactionSink] = None) -> None:
+        """Run compact() every `interval` seconds in a background thread"""
+        if self._compactor:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact(sink)
+                except Exception:
+                    # Unpersisted deltas were restored; the next run retries them
+                    logging.getLogger(__name__).exception("Pledge compaction failed")
+
+        self._sink = sink
+        self._stop.clear()
+        self._compactor = threading.Thread(target=run, name="pledge-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_compaction(self) -> None:
+        """Stop the background compactor and flush what is left"""
+        if self._compactor:
+            self._stop.set()
+            self._compactor.join()
+            self._compactor = None
+        self.compact(self._sink)
+
+
+def sqlite_sink(conn) -> CompactionSink:
+    """Sink that adds compacted deltas to crowdfunding_projects(current_amount, backers_count)"""
+    lock = threading.Lock()
+
+    def sink(project_id: int, amount: Decimal, backers: int) -> None:
+        with lock, conn:
+            conn.execute(
+                "UPDATE crowdfunding_projects "
+                "SET current_amount = current_amount + ?, backers_count = backers_count + ? "
+                "WHERE id = ?",
+                (str(amount), backers, project_id),
+            )
+
+    return sink
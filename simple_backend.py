@@ -1,20 +1,66 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import os
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from pydantic import BaseModel, Field
 import uvicorn
 
+from audit_log import AuditLog
+from cors_cache import CachedCORSMiddleware
+from http_cache import HTTPCacheMiddleware
+from mock_data import store_from_env
+from search_index import MODULES, SearchIndex
+from sharded_counter import ShardedCounter
+
+
+def load_env_file(path: str) -> None:
+    """Read KEY=VALUE lines from a .env file; variables already set in the environment win"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            name, value = line.split("=", 1)
+            os.environ.setdefault(name.strip(), value.strip().strip("\"'"))
+
+
+load_env_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
 app = FastAPI(
     title="TechVerse Simple API",
     description="Simple backend for TechVerse frontend demonstration",
     version="1.0.0"
 )
 
-# CORS Middleware
+# Middleware counters, served by /api/metrics
+metrics = {"cors": {}, "http_cache": {}}
+
+# Compression and ETag/Last-Modified validators (inside CORS so 304s keep CORS headers)
 app.add_middleware(
-    CORSMiddleware,
+    HTTPCacheMiddleware,
+    minimum_size=1024,
+    validator_ttl=30.0,
+    # Payloads that change without an unsafe request to the same path, or read from a TTL cache
+    exclude_paths=[
+        "/api/metrics",
+        "/api/techfinance/crowdfunding",
+        "/api/auth/login-history",
+        "/api/auth/security-events",
+    ],
+    stats=metrics["http_cache"],
+)
+
+# CORS Middleware (preflight responses are cached per origin/method/headers)
+app.add_middleware(
+    CachedCORSMiddleware,
     allow_origins=["http://localhost:3003", "http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=int(os.getenv("CORS_MAX_AGE", "86400")),
+    stats=metrics["cors"],
 )
 
 # Health check endpoint
@@ -26,6 +72,11 @@ async def health_check():
         "version": "1.0.0"
     }
 
+# Middleware metrics
+@app.get("/api/metrics")
+async def get_metrics():
+    return metrics
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -53,35 +104,157 @@ async def get_current_user():
         "role": "user"
     }
 
+# Synthetic data behind the mock endpoints (sized by MOCK_* env vars or loaded from MOCK_DATA_DIR)
+mock_store = store_from_env()
+DEMO_USER_ID = 1
+
 @app.get("/api/techconnect/chats")
-async def get_chats():
+async def get_chats(page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=200)):
     return {
-        "chats": [
-            {
-                "id": 1,
-                "name": "Tech Innovation Group",
-                "last_message": "Welcome to TechVerse!",
-                "unread_count": 0
-            },
-            {
-                "id": 2, 
-                "name": "Finance Discussion",
-                "last_message": "New investment opportunities",
-                "unread_count": 3
-            }
-        ]
+        "chats": mock_store.chats(page, page_size),
+        "page": page,
+        "page_size": page_size,
+        "total": mock_store.chat_count,
+    }
+
+@app.get("/api/techconnect/chats/{chat_id}/messages")
+async def get_chat_messages(chat_id: int, page: int = Query(1, ge=1),
+                            page_size: int = Query(50, ge=1, le=200)):
+    if not 1 <= chat_id <= mock_store.chat_count:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    return {
+        "messages": mock_store.messages(chat_id, page, page_size),
+        "page": page,
+        "page_size": page_size,
+        "total": mock_store.message_count(chat_id),
     }
 
 @app.get("/api/techfinance/wallet")
-async def get_wallet():
+async def get_wallet(page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=200)):
     return {
-        "balance": 1500.50,
+        "balance": mock_store.balance(DEMO_USER_ID),
         "currency": "USD",
-        "transactions": [
-            {"id": 1, "amount": 100, "type": "deposit", "date": "2024-01-15"},
-            {"id": 2, "amount": -50, "type": "withdrawal", "date": "2024-01-14"}
-        ]
+        "transactions": mock_store.transactions(DEMO_USER_ID, page, page_size),
+        "page": page,
+        "page_size": page_size,
+        "total": mock_store.transaction_count(DEMO_USER_ID),
     }
 
+# Full-text search across TechLearn, TechMarket and TechHub
+search_index = SearchIndex()
+search_index.index_many([
+    ("techlearn", 1, "Python for Beginners", "Learn Python programming from scratch with hands-on projects"),
+    ("techlearn", 2, "مقدمة في الذكاء الاصطناعي", "دورة تعليمية في أساسيات التعلم الآلي والشبكات العصبية"),
+    ("techmarket", 1, "React Frontend Development", "Freelance service building React and TypeScript web apps"),
+    ("techmarket", 2, "تصميم واجهات المستخدم", "خدمة تصميم واجهات وتجربة مستخدم للتطبيقات"),
+    ("techhub", 1, "Blockchain in Finance", "Discussion about NFT certificates and TechCoin payments"),
+    ("techhub", 2, "مجتمع المطورين العرب", "منشور للتعارف وتبادل الخبرات البرمجية"),
+])
+
+
+class SearchDocument(BaseModel):
+    title: str
+    body: str = ""
+
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1),
+    module: Optional[str] = None,
+    prefix: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+):
+    if module and module not in MODULES:
+        raise HTTPException(status_code=400, detail=f"Unknown module: {module}")
+    results = search_index.search(q, module=module, limit=limit, prefix=prefix)
+    return {"query": q, "count": len(results), "results": results}
+
+@app.put("/api/search/documents/{module}/{ref_id}")
+async def index_document(module: str, ref_id: str, document: SearchDocument):
+    if module not in MODULES:
+        raise HTTPException(status_code=400, detail=f"Unknown module: {module}")
+    search_index.index(module, ref_id, document.title, document.body)
+    return {"module": module, "id": ref_id, "indexed": True}
+
+@app.delete("/api/search/documents/{module}/{ref_id}")
+async def remove_document(module: str, ref_id: str):
+    if not search_index.remove(module, ref_id):
+        raise HTTPException(status_code=404, detail="Document not indexed")
+    return {"module": module, "id": ref_id, "indexed": False}
+
+# Crowdfunding pledge totals, sharded so hot campaigns don't serialize on one counter
+pledge_counter = ShardedCounter(num_shards=16, cache_ttl=0.5)
+
+
+class Pledge(BaseModel):
+    amount: float = Field(..., gt=0)
+
+
+@app.on_event("startup")
+async def start_pledge_compaction():
+    pledge_counter.start_compaction(interval=5.0)
+
+@app.on_event("shutdown")
+async def stop_pledge_compaction():
+    pledge_counter.stop_compaction()
+
+@app.post("/api/techfinance/crowdfunding/{project_id}/pledge")
+async def pledge(project_id: int, pledge: Pledge):
+    pledge_counter.add(project_id, pledge.amount)
+    return {"project_id": project_id, "pledged": pledge.amount}
+
+@app.get("/api/techfinance/crowdfunding/{project_id}")
+async def get_crowdfunding_project(project_id: int):
+    amount, backers = pledge_counter.total(project_id)
+    return {"id": project_id, "current_amount": float(amount), "backers_count": backers}
+
+# Login history and security events, written in batches off the request path
+audit_log = AuditLog(os.getenv("AUDIT_LOG_DIR", os.path.join("logs", "audit")))
+metrics["audit_log"] = audit_log.stats
+
+
+class LoginRequest(BaseModel):
+    username: str
+    password: str
+
+
+@app.on_event("startup")
+async def start_audit_log():
+    audit_log.start()
+
+@app.on_event("shutdown")
+async def stop_audit_log():
+    audit_log.stop()
+
+@app.post("/api/auth/login")
+async def login(credentials: LoginRequest, request: Request):
+    success = credentials.username == "demo_user" and bool(credentials.password)
+    audit_log.record_login(
+        DEMO_USER_ID if credentials.username == "demo_user" else None,
+        success,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+    )
+    if not success:
+        audit_log.record_security_event(
+            DEMO_USER_ID if credentials.username == "demo_user" else None,
+            "failed_login",
+            severity="warning",
+            details={
+                "username": credentials.username,
+                "ip_address": request.client.host if request.client else None,
+            },
+        )
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+    return {"access_token": "demo-access-token", "refresh_token": "demo-refresh-token", "token_type": "bearer"}
+
+@app.get("/api/auth/login-history")
+async def get_login_history(limit: int = Query(50, ge=1, le=500)):
+    return {"history": audit_log.history(DEMO_USER_ID, "login_history", limit)}
+
+@app.get("/api/auth/security-events")
+async def get_security_events(limit: int = Query(50, ge=1, le=500)):
+    return {"events": audit_log.history(DEMO_USER_ID, "security_events", limit)}
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
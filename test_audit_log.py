@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched append-only audit log
+Run with: python -m pytest test_audit_log.py
+"""
+
+import glob
+import os
+import time
+
+import pytest
+
+import audit_log
+from audit_log import AuditLog
+
+
+def _segment(directory, kind="login_history"):
+    return glob.glob(os.path.join(directory, f"{kind}-*.jsonl"))[0]
+
+
+def test_history_is_newest_first_across_buffer_and_disk(tmp_path):
+    log = AuditLog(str(tmp_path))
+    for _ in range(3):
+        log.record_login(1, True)
+    log.flush()
+    log.record_login(1, False)
+    log.record_login(2, True)
+    assert [event["id"] for event in log.history(1)] == [4, 3, 2, 1]
+    assert [event["id"] for event in log.history(1, limit=2)] == [4, 3]
+    with pytest.raises(ValueError):
+        log.history(1, kind="payments")
+
+
+def test_index_is_rebuilt_on_restart(tmp_path):
+    log = AuditLog(str(tmp_path))
+    log.record_login(1, True)
+    log.record_security_event(1, "failed_login", severity="warning")
+    log.stop()
+    restarted = AuditLog(str(tmp_path))
+    assert [event["id"] for event in restarted.history(1)] == [1]
+    assert restarted.history(1, "security_events")[0]["event_type"] == "failed_login"
+    restarted.record_login(1, True)
+    assert restarted.history(1)[0]["id"] == 3
+
+
+def test_torn_tail_is_truncated_and_later_events_survive_restart(tmp_path):
+    log = AuditLog(str(tmp_path))
+    log.record_login(1, True)
+    log.flush()
+    with open(_segment(str(tmp_path)), "ab") as f:
+        f.write(b'{"id": 99, "user_')
+
+    restarted = AuditLog(str(tmp_path))
+    restarted.record_login(1, False)
+    restarted.flush()
+    assert [event["id"] for event in AuditLog(str(tmp_path)).history(1)] == [2, 1]
+
+
+def test_append_after_failed_write_starts_a_new_line(tmp_path):
+    log = AuditLog(str(tmp_path))
+    log.record_login(1, True)
+    log.flush()
+    with open(_segment(str(tmp_path)), "ab") as f:
+        f.write(b'{"id": 99, "user_')
+    log.record_login(1, False)
+    log.flush()
+    assert [event["id"] for event in log.history(1)] == [2, 1]
+    assert [event["id"] for event in AuditLog(str(tmp_path)).history(1)] == [2, 1]
+
+
+def test_corrupt_and_non_event_lines_are_skipped(tmp_path):
+    log = AuditLog(str(tmp_path))
+    log.record_login(1, True)
+    log.flush()
+    with open(_segment(str(tmp_path)), "ab") as f:
+        f.write(b'garbage\n123\n{"no": "ids"}\n[1, 2]\n')
+    log.record_login(1, True)
+    log.flush()
+
+    restarted = AuditLog(str(tmp_path))
+    assert [event["id"] for event in restarted.history(1)] == [2, 1]
+    restarted.record_login(1, True)
+    assert restarted.history(1)[0]["id"] == 3
+
+
+def test_failed_flush_keeps_events_for_retry(tmp_path, monkeypatch):
+    log = AuditLog(str(tmp_path))
+    log.record_login(1, True)
+    log.record_login(1, False)
+
+    def broken_open(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(audit_log, "open", broken_open, raising=False)
+    with pytest.raises(OSError):
+        log.flush()
+    log.record_login(1, True)
+    with pytest.raises(OSError):
+        log.flush()
+    monkeypatch.undo()
+
+    assert log.flush() == 3
+    assert [event["id"] for event in AuditLog(str(tmp_path)).history(1)] == [3, 2, 1]
+
+
+def test_background_flusher_survives_io_errors(tmp_path, monkeypatch):
+    log = AuditLog(str(tmp_path), flush_interval=0.01)
+    failures = []
+    real_flush = log.flush
+
+    def flaky_flush():
+        if len(failures) < 2:
+            failures.append(1)
+            raise OSError("disk full")
+        return real_flush()
+
+    monkeypatch.setattr(log, "flush", flaky_flush)
+    log.record_login(1, True)
+    log.start()
+    deadline = time.monotonic() + 2
+    while log.stats["flushed_events"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    log.stop()
+    assert len(failures) == 2
+    assert log.stats["flushed_events"] == 1
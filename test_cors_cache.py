@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the CORS middleware with cached preflight responses
+Run with: python -m pytest test_cors_cache.py
+"""
+
+import asyncio
+
+from cors_cache import CachedCORSMiddleware
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def request(app, method, headers):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/api/health", "query_string": b"",
+             "headers": [(name.encode(), value.encode()) for name, value in headers]}
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+
+
+def preflight(app, origin, method="GET"):
+    return request(app, "OPTIONS", [("origin", origin), ("access-control-request-method", method)])
+
+
+def make_middleware(**kwargs):
+    return CachedCORSMiddleware(_app, allow_origins=["http://localhost:3000"], allow_methods=["*"],
+                                allow_headers=["*"], allow_credentials=True, max_age=600, **kwargs)
+
+
+def test_allowed_preflight_is_cached():
+    app = make_middleware()
+    for _ in range(3):
+        status, headers = preflight(app, "http://localhost:3000", "PUT")
+        assert status == 200
+        assert headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert headers["access-control-max-age"] == "600"
+    assert app.stats["preflight_requests"] == 3
+    assert app.stats["preflight_cache_hits"] == 2
+
+
+def test_rejected_preflights_do_not_evict_cached_ones():
+    app = make_middleware(max_cached_preflights=2)
+    preflight(app, "http://localhost:3000")
+    for i in range(10):
+        status, _ = preflight(app, f"http://attacker{i}.example")
+        assert status == 400
+    assert list(app._preflights) == [("http://localhost:3000", "GET", "")]
+    assert app.stats["preflight_rejected"] == 10
+    preflight(app, "http://localhost:3000")
+    assert app.stats["preflight_cache_hits"] == 1
+
+
+def test_simple_request_gets_origin_only_when_allowed():
+    app = make_middleware()
+    _, headers = request(app, "GET", [("origin", "http://localhost:3000")])
+    assert headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert headers["access-control-allow-credentials"] == "true"
+    _, headers = request(app, "GET", [("origin", "http://attacker.example")])
+    assert "access-control-allow-origin" not in headers
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the OLTP/analytics database router and its CDC sync, using two local SQLite files
+Run with: python -m pytest test_db_router.py
+"""
+
+import pytest
+
+from db_router import DatabaseRouter
+
+
+def make_router(tmp_path, **kwargs):
+    router = DatabaseRouter(f"sqlite:///{tmp_path}/oltp.db", f"sqlite:///{tmp_path}/analytics.db", **kwargs)
+    router.execute("CREATE TABLE IF NOT EXISTS wallets (id INTEGER PRIMARY KEY, owner TEXT, balance REAL)")
+    router.track("wallets")
+    return router
+
+
+def test_analytics_rejects_writes(tmp_path):
+    router = make_router(tmp_path)
+    with pytest.raises(ValueError):
+        router.analytics("DELETE FROM wallets")
+
+
+def test_read_your_writes_falls_back_to_primary_until_synced(tmp_path):
+    router = make_router(tmp_path)
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (1, 'sara', 10)", session="sara")
+    assert router.analytics("SELECT COUNT(*) FROM wallets", session="sara") == [(1,)]
+    assert router.analytics("SELECT COUNT(*) FROM wallets") == [(0,)]
+    assert router.stats["read_your_writes_fallbacks"] == 1
+
+    router.sync_all()
+    assert router.analytics("SELECT COUNT(*) FROM wallets", session="sara") == [(1,)]
+    assert router.stats["read_your_writes_fallbacks"] == 1
+    assert router._session_positions == {}
+
+
+def test_write_only_sessions_are_pruned_after_sync(tmp_path):
+    router = make_router(tmp_path)
+    for i in range(5):
+        router.execute("INSERT INTO wallets (id, owner, balance) VALUES (:id, 'x', 0)", {"id": i}, session=f"s{i}")
+    assert len(router._session_positions) == 5
+    router.sync_all()
+    assert router._session_positions == {}
+
+
+def test_last_change_per_row_wins_within_a_batch(tmp_path):
+    router = make_router(tmp_path)
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (1, 'omar', 5)")
+    for balance in (6, 7, 8):
+        router.execute("UPDATE wallets SET balance = :balance WHERE id = 1", {"balance": balance})
+    assert router.lag() == 4
+    assert router.sync() == 4
+    assert router.analytics("SELECT owner, balance FROM wallets") == [("omar", 8.0)]
+    assert router.lag() == 0
+
+
+def test_deletes_propagate(tmp_path):
+    router = make_router(tmp_path)
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (1, 'lina', 1), (2, 'nour', 2)")
+    router.sync_all()
+    router.execute("DELETE FROM wallets WHERE id = 1")
+    router.sync_all()
+    assert router.analytics("SELECT id FROM wallets") == [(2,)]
+
+
+def test_watermark_survives_restart(tmp_path):
+    router = make_router(tmp_path)
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (1, 'ali', 1)")
+    router.sync_all()
+    watermark = router._watermark
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (2, 'mona', 2)")
+
+    restarted = make_router(tmp_path)
+    assert restarted._watermark == watermark
+    assert restarted.lag() == 1
+    assert restarted.sync_all() == 1
+    assert restarted.analytics("SELECT id FROM wallets ORDER BY id") == [(1,), (2,)]
+
+
+def test_late_commit_below_watermark_is_still_shipped(tmp_path):
+    router = make_router(tmp_path, settle_seconds=60)
+    # Change 2 "commits" after change 3, as can happen with concurrent InnoDB transactions
+    insert = ("INSERT INTO _cdc_changes (id, table_name, op, pk, payload) "
+              "VALUES (:id, 'wallets', 'upsert', :pk, json_object('id', :pk, 'owner', 'late', 'balance', 0))")
+    router.primary.execute(insert, {"id": 1, "pk": 1})
+    router.primary.execute(insert, {"id": 3, "pk": 3})
+    router.sync_all()
+    assert router._watermark == 1
+    # The watermark is held at the gap, so this session keeps reading its write from the primary
+    router.execute("INSERT INTO wallets (id, owner, balance) VALUES (9, 'x', 0)", session="s")
+    router.sync_all()
+    assert router._watermark == 1
+    assert router.analytics("SELECT id FROM wallets", session="s") == [(9,)]
+    assert router.stats["read_your_writes_fallbacks"] == 1
+
+    router.primary.execute(insert, {"id": 2, "pk": 2})
+    router.sync_all()
+    assert router.analytics("SELECT id FROM wallets ORDER BY id") == [(1,), (2,), (3,), (9,)]
+    assert router._watermark == router.primary.execute("SELECT seq FROM sqlite_sequence "
+                                                       "WHERE name = '_cdc_changes'")[0][0]
+
+
+def test_rolled_back_gap_is_skipped_after_settling(tmp_path):
+    router = make_router(tmp_path, settle_seconds=0)
+    router.primary.execute("INSERT INTO _cdc_changes (id, table_name, op, pk, payload) "
+                           "VALUES (5, 'wallets', 'delete', 5, NULL)")
+    router.sync_all()
+    assert router._watermark == 5
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the compression and HTTP caching middleware
+Run with: python -m pytest test_http_cache.py
+"""
+
+import asyncio
+import gzip
+
+from http_cache import HTTPCacheMiddleware
+
+
+class _Resource:
+    """ASGI app serving a mutable JSON body and counting handler runs"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+def request(app, method="GET", path="/api/items", headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"",
+             "headers": [(name.encode(), value.encode()) for name, value in headers]}
+    asyncio.run(app(scope, receive, send))
+    response_headers = {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+    return messages[0]["status"], response_headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_conditional_get_short_circuits_until_invalidated():
+    resource = _Resource(b'{"items": [1]}')
+    app = HTTPCacheMiddleware(resource)
+    _, headers, _ = request(app)
+    status, _, _ = request(app, headers=[("if-none-match", headers["etag"])])
+    assert status == 304 and resource.calls == 1
+
+    resource.body = b'{"items": [1, 2]}'
+    request(app, method="POST")
+    status, _, body = request(app, headers=[("if-none-match", headers["etag"])])
+    assert status == 200 and body == resource.body
+
+
+def test_changed_body_in_same_second_is_not_reported_unmodified():
+    resource = _Resource(b'{"v": 1}')
+    app = HTTPCacheMiddleware(resource)
+    _, headers, _ = request(app)
+    resource.body = b'{"v": 2}'
+    request(app, method="POST")
+    status, new_headers, _ = request(app, headers=[("if-modified-since", headers["last-modified"])])
+    assert status == 200
+    assert new_headers["last-modified"] != headers["last-modified"]
+
+
+def test_excluded_paths_always_run_the_handler():
+    resource = _Resource(b'{"counter": 1}')
+    app = HTTPCacheMiddleware(resource, exclude_paths=["/api/metrics"])
+    _, headers, _ = request(app, path="/api/metrics")
+    status, _, _ = request(app, path="/api/metrics", headers=[("if-none-match", headers["etag"])])
+    assert status == 304 and resource.calls == 2
+    assert not app._validators
+
+
+def test_validators_are_bounded():
+    app = HTTPCacheMiddleware(_Resource(b"{}"), max_validators=5)
+    for i in range(20):
+        request(app, path=f"/api/items/{i}")
+    assert [key[0] for key in app._validators] == [f"/api/items/{i}" for i in range(15, 20)]
+
+
+def test_large_bodies_are_gzipped():
+    resource = _Resource(b'{"text": "' + b"x" * 4096 + b'"}')
+    app = HTTPCacheMiddleware(resource)
+    _, headers, body = request(app, headers=[("accept-encoding", "gzip")])
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == resource.body
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the FTS5 search index (ranked search and Arabic/English typeahead)
+Run with: python -m pytest test_search_index.py
+"""
+
+from search_index import SearchIndex, tokenize
+
+
+def _ids(results):
+    return sorted(result["id"] for result in results)
+
+
+def make_index():
+    index = SearchIndex()
+    index.index_many([
+        ("techlearn", 1, "مقدمة في الذكاء الاصطناعي", "أساسيات التعلم الآلي"),
+        ("techlearn", 2, "أساسيات والبرمجة", "دورة للمبتدئين"),
+        ("techhub", 3, "دليل بالذكاء للمطورين", ""),
+        ("techmarket", 4, "React Frontend Development", "TypeScript web apps"),
+    ])
+    return index
+
+
+def test_tokenize_strips_article_and_attached_prefixes():
+    assert tokenize("والبرمجة بالذكاء للمطورين") == ["برمجه", "ذكاء", "مطورين"]
+
+
+def test_ranked_search_matches_stems():
+    index = make_index()
+    assert _ids(index.search("البرمجة")) == ["2"]
+    assert _ids(index.search("الذكاء")) == ["1", "3"]
+    assert _ids(index.search("frontend", module="techmarket")) == ["4"]
+
+
+def test_typeahead_matches_partially_typed_article():
+    index = make_index()
+    for query in ("ال", "الذ", "الذك", "ذك"):
+        assert "1" in _ids(index.search(query, prefix=True)), query
+
+
+def test_typeahead_matches_article_behind_conjunction_or_preposition():
+    index = make_index()
+    assert _ids(index.search("البرمجة", prefix=True)) == ["2"]
+    assert _ids(index.search("البر", prefix=True)) == ["2"]
+    assert _ids(index.search("الذ", prefix=True)) == ["1", "3"]
+    assert _ids(index.search("بالذ", prefix=True)) == ["3"]
+    assert _ids(index.search("المطور", prefix=True)) == ["3"]
+
+
+def test_typeahead_english_prefix():
+    index = make_index()
+    assert _ids(index.search("fron", prefix=True)) == ["4"]
+    assert _ids(index.search("react dev", prefix=True)) == ["4"]
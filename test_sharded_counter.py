@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the sharded crowdfunding pledge counter
+Run with: python -m pytest test_sharded_counter.py
+"""
+
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from sharded_counter import ShardedCounter
+
+
+def test_concurrent_pledges_are_all_counted():
+    counter = ShardedCounter(num_shards=8, cache_ttl=0)
+
+    def pledge():
+        for _ in range(500):
+            counter.add(1, "2.50")
+
+    threads = [threading.Thread(target=pledge) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.total(1) == (Decimal("10000.00"), 4000)
+    assert counter.compact() == 1
+    assert counter.total(1) == (Decimal("10000.00"), 4000)
+
+
+def test_pledges_from_one_thread_spread_over_shards():
+    counter = ShardedCounter(num_shards=16)
+    for _ in range(400):
+        counter.add(1, 1)
+    assert sum(1 for shard in counter._shards if shard.amounts) > 1
+
+
+def test_sink_failure_keeps_deltas_for_retry():
+    counter = ShardedCounter(cache_ttl=0)
+    for project_id in (1, 2, 3):
+        counter.add(project_id, 10, backers=2)
+    persisted = {}
+
+    def failing_sink(project_id, amount, backers):
+        if project_id == 2:
+            raise RuntimeError("database unavailable")
+        persisted[project_id] = (amount, backers)
+
+    with pytest.raises(RuntimeError):
+        counter.compact(failing_sink)
+    for project_id in (1, 2, 3):
+        assert counter.total(project_id) == (Decimal(10), 2)
+
+    counter.compact(lambda project_id, amount, backers: persisted.__setitem__(project_id, (amount, backers)))
+    assert persisted == {1: (Decimal(10), 2), 2: (Decimal(10), 2), 3: (Decimal(10), 2)}
+    for project_id in (1, 2, 3):
+        assert counter.total(project_id) == (Decimal(10), 2)
+
+
+def test_total_cache_is_bounded_and_expires():
+    counter = ShardedCounter(cache_ttl=0.05, max_cached_totals=10)
+    for project_id in range(100):
+        counter.total(project_id)
+    assert len(counter._cache) == 10
+    time.sleep(0.06)
+    counter.total(1000)
+    assert list(counter._cache) == [1000]
+
+
+def test_on_write_runs_under_the_shard_lock():
+    held = []
+    counter = ShardedCounter(num_shards=1)
+    counter.on_write = lambda: held.append(counter._shards[0].lock.locked())
+    counter.add(1, 5)
+    assert held == [True]
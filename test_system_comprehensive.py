@@ -8,46 +8,99 @@ import sys
 import os
 import requests
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 class TechVerseSystemTest:
-    def __init__(self):
+    def __init__(self, timeout=10, retries=3):
         self.base_url = "http://localhost:8000/api/v1"
         self.access_token = None
         self.refresh_token = None
         self.user_id = None
         self.test_results = []
+        self.timeout = timeout
+        self.started_at = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        
+        # Connection pool shared by all sections; only idempotent calls are retried
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=0.3,
+                      status_forcelist=[502, 503, 504])
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retry)
+        
+    @property
+    def session(self):
+        """Per-thread Session (Session isn't thread-safe) mounting the shared pooled adapter"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+        return session
+        
+    def request(self, method, url, **kwargs):
+        """Send a request over the pooled session with a timeout, timing the call"""
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            self._local.duration = getattr(self._local, "duration", 0.0) + time.perf_counter() - start
+            
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+        
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+        
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
         
     def log_test(self, test_name, success, message=""):
-        """Log test result"""
+        """Log test result with the time spent in HTTP calls since the previous result"""
+        duration = getattr(self._local, "duration", 0.0)
+        self._local.duration = 0.0
         result = {
             "test": test_name,
             "success": success,
             "message": message,
+            "duration_ms": round(duration * 1000, 2),
             "timestamp": datetime.now().isoformat()
         }
-        self.test_results.append(result)
+        with self._lock:
+            self.test_results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {message}")
+        print(f"{status} {test_name}: {message} ({result['duration_ms']} ms)")
         
     def run_all_tests(self):
         """Run all system tests"""
         print("🚀 Starting TechVerse Comprehensive System Test")
         print("=" * 60)
+        self.started_at = time.perf_counter()
         
-        # Test sequence
+        # Sequential: everything below depends on the token obtained here
         self.test_health_check()
         self.test_auth_system()
         self.test_user_management()
-        self.test_techfinance_system()
-        self.test_techconnect_system()
-        self.test_techinnovation_system()
-        self.test_translation_system()
-        self.test_security_features()
+        
+        # Independent sections run concurrently over the shared connection pool
+        sections = [
+            self.test_techfinance_system,
+            self.test_techconnect_system,
+            self.test_techinnovation_system,
+            self.test_translation_system,
+            self.test_security_features,
+        ]
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            for future in [executor.submit(section) for section in sections]:
+                future.result()
         
         # Generate report
         self.generate_report()
@@ -55,7 +108,7 @@ class TechVerseSystemTest:
     def test_health_check(self):
         """Test API health endpoint"""
         try:
-            response = requests.get(f"{self.base_url}/health")
+            response = self.get(f"{self.base_url}/health")
             if response.status_code == 200:
                 self.log_test("Health Check", True, "API is running")
             else:
@@ -79,7 +132,7 @@ class TechVerseSystemTest:
         
         try:
             # Register
-            response = requests.post(f"{self.base_url}/auth/register", json=user_data)
+            response = self.post(f"{self.base_url}/auth/register", json=user_data)
             if response.status_code == 200:
                 self.log_test("User Registration", True, "User registered successfully")
             else:
@@ -91,7 +144,7 @@ class TechVerseSystemTest:
                 "username": user_data["username"],
                 "password": user_data["password"]
             }
-            response = requests.post(f"{self.base_url}/auth/login", data=login_data)
+            response = self.post(f"{self.base_url}/auth/login", data=login_data)
             if response.status_code == 200:
                 data = response.json()
                 self.access_token = data["access_token"]
@@ -103,8 +156,8 @@ class TechVerseSystemTest:
                 
             # Test token refresh
             if self.refresh_token:
-                response = requests.post(f"{self.base_url}/auth/refresh", 
-                                       json={"refresh_token": self.refresh_token})
+                response = self.post(f"{self.base_url}/auth/refresh", 
+                                   json={"refresh_token": self.refresh_token})
                 if response.status_code == 200:
                     self.log_test("Token Refresh", True, "Token refreshed successfully")
                 else:
@@ -112,7 +165,7 @@ class TechVerseSystemTest:
                     
             # Test get current user
             headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(f"{self.base_url}/auth/me", headers=headers)
+            response = self.get(f"{self.base_url}/auth/me", headers=headers)
             if response.status_code == 200:
                 user_data = response.json()
                 self.user_id = user_data["id"]
@@ -139,8 +192,8 @@ class TechVerseSystemTest:
                 "full_name": "Updated Test User",
                 "phone_number": "+1987654321"
             }
-            response = requests.put(f"{self.base_url}/auth/me", 
-                                  json=update_data, headers=headers)
+            response = self.put(f"{self.base_url}/auth/me", 
+                              json=update_data, headers=headers)
             if response.status_code == 200:
                 self.log_test("Update Profile", True, "Profile updated successfully")
             else:
@@ -151,8 +204,8 @@ class TechVerseSystemTest:
                 "current_password": "SecurePassword123!",
                 "new_password": "NewSecurePassword123!"
             }
-            response = requests.post(f"{self.base_url}/auth/change-password",
-                                   json=password_data, headers=headers)
+            response = self.post(f"{self.base_url}/auth/change-password",
+                               json=password_data, headers=headers)
             if response.status_code == 200:
                 self.log_test("Change Password", True, "Password changed successfully")
             else:
@@ -173,21 +226,21 @@ class TechVerseSystemTest:
         
         try:
             # Test wallet operations
-            response = requests.get(f"{self.base_url}/techfinance/wallet", headers=headers)
+            response = self.get(f"{self.base_url}/techfinance/wallet", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Wallet", True, "Wallet data retrieved")
             else:
                 self.log_test("Get Wallet", False, f"Status: {response.status_code}")
                 
             # Test transactions
-            response = requests.get(f"{self.base_url}/techfinance/transactions", headers=headers)
+            response = self.get(f"{self.base_url}/techfinance/transactions", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Transactions", True, "Transactions retrieved")
             else:
                 self.log_test("Get Transactions", False, f"Status: {response.status_code}")
                 
             # Test investments
-            response = requests.get(f"{self.base_url}/techfinance/investments", headers=headers)
+            response = self.get(f"{self.base_url}/techfinance/investments", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Investments", True, "Investments retrieved")
             else:
@@ -208,14 +261,14 @@ class TechVerseSystemTest:
         
         try:
             # Test chat rooms
-            response = requests.get(f"{self.base_url}/techconnect/chat-rooms", headers=headers)
+            response = self.get(f"{self.base_url}/techconnect/chat-rooms", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Chat Rooms", True, "Chat rooms retrieved")
             else:
                 self.log_test("Get Chat Rooms", False, f"Status: {response.status_code}")
                 
             # Test collaboration projects
-            response = requests.get(f"{self.base_url}/techconnect/collaboration-projects", headers=headers)
+            response = self.get(f"{self.base_url}/techconnect/collaboration-projects", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Collaboration Projects", True, "Projects retrieved")
             else:
@@ -236,14 +289,14 @@ class TechVerseSystemTest:
         
         try:
             # Test innovation labs
-            response = requests.get(f"{self.base_url}/techinnovation/labs", headers=headers)
+            response = self.get(f"{self.base_url}/techinnovation/labs", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Innovation Labs", True, "Labs retrieved")
             else:
                 self.log_test("Get Innovation Labs", False, f"Status: {response.status_code}")
                 
             # Test innovation projects
-            response = requests.get(f"{self.base_url}/techinnovation/projects", headers=headers)
+            response = self.get(f"{self.base_url}/techinnovation/projects", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Innovation Projects", True, "Projects retrieved")
             else:
@@ -269,15 +322,15 @@ class TechVerseSystemTest:
                 "target_language": "ar",
                 "source_language": "en"
             }
-            response = requests.post(f"{self.base_url}/translation/translate",
-                                   json=translation_data, headers=headers)
+            response = self.post(f"{self.base_url}/translation/translate",
+                               json=translation_data, headers=headers)
             if response.status_code == 200:
                 self.log_test("Text Translation", True, "Text translated successfully")
             else:
                 self.log_test("Text Translation", False, f"Status: {response.status_code}")
                 
             # Test supported languages
-            response = requests.get(f"{self.base_url}/translation/languages", headers=headers)
+            response = self.get(f"{self.base_url}/translation/languages", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Languages", True, "Languages retrieved")
             else:
@@ -298,14 +351,14 @@ class TechVerseSystemTest:
         
         try:
             # Test security settings
-            response = requests.get(f"{self.base_url}/auth/security/settings", headers=headers)
+            response = self.get(f"{self.base_url}/auth/security/settings", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Security Settings", True, "Settings retrieved")
             else:
                 self.log_test("Get Security Settings", False, f"Status: {response.status_code}")
                 
             # Test login history
-            response = requests.get(f"{self.base_url}/auth/login-history", headers=headers)
+            response = self.get(f"{self.base_url}/auth/login-history", headers=headers)
             if response.status_code == 200:
                 self.log_test("Get Login History", True, "History retrieved")
             else:
@@ -313,7 +366,7 @@ class TechVerseSystemTest:
                 
             # Test invalid token
             invalid_headers = {"Authorization": "Bearer invalid_token"}
-            response = requests.get(f"{self.base_url}/auth/me", headers=invalid_headers)
+            response = self.get(f"{self.base_url}/auth/me", headers=invalid_headers)
             if response.status_code == 401:
                 self.log_test("Invalid Token Protection", True, "Invalid token rejected")
             else:
@@ -344,6 +397,12 @@ class TechVerseSystemTest:
                 if not result["success"]:
                     print(f"  - {result['test']}: {result['message']}")
         
+        # Show slowest endpoints
+        slowest = sorted(self.test_results, key=lambda result: result["duration_ms"], reverse=True)[:5]
+        print("\n🐢 Slowest Tests:")
+        for result in slowest:
+            print(f"  - {result['test']}: {result['duration_ms']} ms")
+        
         # Save detailed report
         report = {
             "summary": {
@@ -351,6 +410,8 @@ class TechVerseSystemTest:
                 "passed_tests": passed_tests,
                 "failed_tests": failed_tests,
                 "success_rate": (passed_tests/total_tests)*100,
+                "total_duration_s": round(time.perf_counter() - self.started_at, 3) if self.started_at else None,
+                "slowest_tests": [result["test"] for result in slowest],
                 "timestamp": datetime.now().isoformat()
             },
             "detailed_results": self.test_results
@@ -378,4 +439,4 @@ if __name__ == "__main__":
     
     # Run tests
     tester = TechVerseSystemTest()
-    tester.run_all_tests()
\ No newline at end of file
+    tester.run_all_tests()
\ No newline at end of file